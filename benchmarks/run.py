@@ -0,0 +1,246 @@
+'''
+Headless benchmarks of the analyses behind main.py, on synthetic frames (no network, no Streamlit).
+
+    python benchmarks/run.py                                  # 10k / 100k / 1M rows x 10 / 100 columns
+    python benchmarks/run.py --rows 10000000 --columns 500    # one large case
+    python benchmarks/run.py --save-baseline                  # store the results as the baseline
+    python benchmarks/run.py --compare                        # exit 1 when a stage got slower than the baseline
+
+Every stage records its wall time and the peak resident memory it added on top of the process.
+'''
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolkit.charts import apply_theme, density_grid, pair_grid
+from toolkit.columnar import read_columnar
+from toolkit.correlation import correlation_matrix, variance_inflation_factors
+from toolkit.figures import render_job
+from toolkit.filtering import ColumnIndex, Condition, filter_positions
+from toolkit.ingest import read_csv_chunked
+from toolkit.perf import rss_bytes
+from toolkit.plotting import fold_categories, is_large, stratified_sample
+from toolkit.profiling import build_profile
+from toolkit.stats import group_statistics, one_way_anova
+from toolkit.summary import frame_chunks, summarize_chunks
+#------------------------------------------------------------------------------------------------------#
+
+DEFAULT_ROWS = (10_000, 100_000, 1_000_000)
+DEFAULT_COLUMNS = (10, 100)
+MAX_CELLS = 500_000_000          # larger cases are skipped unless --max-cells is raised (8 bytes per cell)
+CSV_MAX_CELLS = 50_000_000       # the CSV load stage writes the frame to text first: only for smaller cases
+PAIRPLOT_COLUMNS = 5
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TOLERANCE = 0.25                 # a stage regresses when it is this much slower than the baseline ...
+MIN_REGRESSION_SECONDS = 0.05    # ... and at least this many seconds slower
+STAGES = ('load_csv', 'load_parquet', 'profile', 'summary', 'filter', 'anova', 'kde', 'vif', 'correlation', 'pairplot')
+#------------------------------------------------------------------------------------------------------#
+
+def synthetic_frame(n_rows: int, n_columns: int, seed: int = 0) -> pd.DataFrame:
+    '''
+    `n_columns` numeric columns (partly correlated, 1% missing) plus two categorical columns:
+    `group` with 8 uneven levels and `label` with 200 levels.
+    '''
+    rng = np.random.default_rng(seed)
+    factors = rng.standard_normal((n_rows, 3))
+    data = {}
+    for i in range(n_columns):
+        loadings = rng.uniform(-1, 1, 3) if i % 2 else np.zeros(3)
+        values = factors @ loadings + rng.standard_normal(n_rows)
+        values[rng.random(n_rows) < 0.01] = np.nan
+        data[f'x{i}'] = values
+    weights = np.arange(8, 0, -1) / 36
+    data['group'] = pd.Categorical(rng.choice([f'g{i}' for i in range(8)], n_rows, p = weights))
+    data['label'] = pd.Categorical(rng.integers(0, 200, n_rows).astype(str))
+    return pd.DataFrame(data)
+#------------------------------------------------------------------------------------------------------#
+
+class PeakMemory:
+    # Polls the resident memory in a background thread; `peak` is the highest value above the starting one
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start = self.peak = rss_bytes() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target = self._poll, daemon = True)
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, rss_bytes() or 0)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes() or 0)
+
+    @property
+    def added(self) -> int:
+        return self.peak - self.start
+
+
+def measure(stage, run) -> dict:
+    with PeakMemory() as memory:
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+    return {'stage': stage, 'seconds': seconds, 'peak_rss_added': memory.added}
+#------------------------------------------------------------------------------------------------------#
+
+def stage_runners(df: pd.DataFrame, stages = STAGES) -> dict:
+    '''
+    One zero-argument callable per stage, doing what the matching tab of main.py does.
+    The input files of the load stages are written here, outside the timed callables;
+    `load_csv` is left out of cases larger than CSV_MAX_CELLS.
+    '''
+    numeric = [column for column in df.columns if column.startswith('x')]
+    x, y = numeric[0], numeric[1]
+    runners = {}
+
+    if 'load_csv' in stages and df.shape[0] * df.shape[1] <= CSV_MAX_CELLS:
+        csv = df.to_csv(index = False).encode()
+        runners['load_csv'] = lambda: read_csv_chunked(csv)
+
+    if 'load_parquet' in stages:
+        parquet = io.BytesIO()
+        df.to_parquet(parquet)
+        runners['load_parquet'] = lambda: read_columnar(parquet.getvalue(), 'parquet')
+
+    def filter_rows():
+        indexes = {}
+        get_index = lambda column: indexes.setdefault(column, ColumnIndex(df[column]))
+        conditions = [Condition('group', values = ['g0', 'g3']), Condition(x, bounds = (-1.0, 1.0))]
+        filter_positions(get_index, conditions, len(df))
+
+    def anova():
+        one_way_anova(group_statistics(df['group'], df[x]))
+
+    def kde():
+        categories, folded = fold_categories(df['group'].value_counts().index.tolist())
+        render_job(density_grid, df[['group', x, y]], 'group', x, y, categories, is_large(len(df)), len(folded))
+
+    def pairplot():
+        columns = numeric[:PAIRPLOT_COLUMNS]
+        render_job(pair_grid, stratified_sample(df[['group'] + columns], by = 'group'), 'group', columns)
+
+    runners.update({
+        'profile': lambda: build_profile(df),
+        'summary': lambda: summarize_chunks(frame_chunks(df[numeric])),
+        'filter': filter_rows,
+        'anova': anova,
+        'kde': kde,
+        'vif': lambda: variance_inflation_factors(df[numeric]),
+        'correlation': lambda: correlation_matrix(df[numeric]),
+        'pairplot': pairplot,
+    })
+    return runners
+
+
+def run_case(n_rows: int, n_columns: int, stages: list) -> list:
+    df = synthetic_frame(n_rows, n_columns)
+    runners = stage_runners(df, stages)
+    case = f'{n_rows}x{n_columns}'
+    results = []
+    for stage in stages:
+        if stage not in runners:
+            print(f"{case:>16} {stage:<13} skipped (more than {CSV_MAX_CELLS:,} cells)", flush = True)
+            continue
+        result = measure(stage, runners[stage])
+        result['case'] = case
+        results.append(result)
+        print(f"{case:>16} {stage:<13} {result['seconds']:9.3f} s {result['peak_rss_added'] / 1024 ** 2:9.1f} MiB", flush = True)
+    return results
+#------------------------------------------------------------------------------------------------------#
+
+def compare(results: list, baseline: list, tolerance: float = TOLERANCE) -> list:
+    # Stages slower than their baseline by more than `tolerance` (and MIN_REGRESSION_SECONDS)
+    reference = {(entry['case'], entry['stage']): entry['seconds'] for entry in baseline}
+    regressions = []
+    for result in results:
+        before = reference.get((result['case'], result['stage']))
+        if before is None:
+            continue
+        if result['seconds'] > before * (1 + tolerance) and result['seconds'] - before > MIN_REGRESSION_SECONDS:
+            regressions.append({**result, 'baseline_seconds': before, 'ratio': result['seconds'] / before})
+    return regressions
+
+
+def parse_sizes(text: str) -> list:
+    return [int(float(value)) for value in text.split(',') if value]
+
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type = parse_sizes, default = list(DEFAULT_ROWS), help = 'comma-separated row counts, e.g. 1e4,1e7')
+    parser.add_argument('--columns', type = parse_sizes, default = list(DEFAULT_COLUMNS), help = 'comma-separated numeric column counts')
+    parser.add_argument('--stages', default = ','.join(STAGES), help = f"comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument('--max-cells', type = float, default = MAX_CELLS, help = 'skip cases with more rows x columns than this')
+    parser.add_argument('--output', help = 'write the results to this JSON file')
+    parser.add_argument('--baseline', default = BASELINE_PATH, help = 'baseline JSON file')
+    parser.add_argument('--save-baseline', action = 'store_true', help = 'overwrite the baseline with these results')
+    parser.add_argument('--compare', action = 'store_true', help = 'compare with the baseline and exit 1 on a regression')
+    parser.add_argument('--tolerance', type = float, default = TOLERANCE)
+    args = parser.parse_args(argv)
+
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    apply_theme()
+    results = []
+    for n_rows in args.rows:
+        for n_columns in args.columns:
+            if n_rows * n_columns > args.max_cells:
+                print(f"{n_rows}x{n_columns:<10} skipped (more than --max-cells {args.max_cells:.0f})")
+                continue
+            results += run_case(n_rows, n_columns, stages)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent = 2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent = 2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}: run with --save-baseline first")
+            return 2
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} {regression['stage']}: "
+                  f"{regression['seconds']:.3f} s vs {regression['baseline_seconds']:.3f} s (x{regression['ratio']:.2f})")
+        if regressions:
+            return 1
+        print("No regression against the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,20 +1,44 @@
 import streamlit as st
-import seaborn as sns
-import statsmodels.api as sm
-from statsmodels.stats.outliers_influence import variance_inflation_factor
+import os
+import threading
+import time
+import uuid
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from pygwalker.api.streamlit import StreamlitRenderer
-from scipy.stats import f_oneway
 from streamlit_option_menu import option_menu
+from toolkit.loading import DatasetCache, fingerprint_bytes, load_seaborn_dataset
+from toolkit.ingest import MEMORY_BUDGET, iter_csv_chunks, read_csv_chunked
+from toolkit.columnar import (COLUMNAR_FORMATS, DATA_DIR, FILE_FORMATS, detect_format, list_server_files,
+                              read_columnar, read_schema, server_file_fingerprint)
+from toolkit.profiling import DatasetProfile, build_profile
+from toolkit.filtering import ColumnIndex, Condition
+from toolkit.plotting import (binned_fill_kdeplot, binned_violinplot, is_large, is_sampled,
+                              pointplot_from_stats, sample_note, stratified_sample)
+from toolkit.figures import cached_render, render_job
+from toolkit.charts import apply_theme, density_grid, pair_grid, preload, regression_grid
+from toolkit.jobs import JobRunner
+from toolkit.correlation import ANNOT_MAX_COLUMNS, CORRELATION_METHODS, KENDALL_SAMPLE_ROWS, VIF_SAMPLE_ROWS, sample_frame, variance_inflation_factors
+from toolkit.analysis import (AnovaReport, CorrelationReport, anova_report, correlation_report, density_plan, filter_rows,
+                              value_count_table)
+from toolkit.summary import SUMMARY_PERCENTILES, frame_chunks, summarize_chunks
+from toolkit.grid import DEFAULT_PAGE_SIZE, PAGE_SIZES, arrow_page, page_count, page_rows, restrict_order, sort_positions
+from toolkit.perf import SLOW_RERUN_SECONDS, PerfLog, PerfRecorder
+from toolkit.backends import DEFAULT_QUERY_ENGINE, available_engines, clear_spills, csv_kinds, open_backend, spill_upload
+from toolkit.artifacts import ArtifactGraph
+#------------------------------------------------------------------------------------------------------#
+
+# Timings of this rerun, stage by stage; recorded into the process-wide log at the end of the script
+perf = PerfRecorder()
+
+@st.cache_resource
+def get_perf_log() -> 'PerfLog':
+    return PerfLog()
 #------------------------------------------------------------------------------------------------------#
 
 st.header("🧰 Exploratory Data Analysis Toolkit")
 st.caption('''
 *This app aimed to **Simplify the process of understanding datasets** by providing Tools for Statistical insights and Visualizations*
 ''')
-sns.set_theme(style = "whitegrid")
 st.logo("assets/button.png")
 #------------------------------------------------------------------------------------------------------#
 
@@ -113,6 +137,13 @@ dataset_columns = {
 #------------------------------------------------------------------------------------------------------#
 
 
+def upload_fingerprint(uploaded_file) -> str:
+    # Hash each upload once per session instead of on every rerun
+    hashes = st.session_state.setdefault('upload_fingerprints', {})
+    if uploaded_file.file_id not in hashes:
+        hashes[uploaded_file.file_id] = fingerprint_bytes(uploaded_file.getvalue())
+    return hashes[uploaded_file.file_id]
+
 # Allow user to upload a file or choose a predefined dataset
 with st.sidebar:
     st.title("👾 Choose a Dataset")
@@ -125,37 +156,316 @@ with st.sidebar:
     st.divider()
 
     uploaded_file = st.file_uploader(
-        '🅱️ or Upload a CSV File',
-        type = 'csv',
+        '🅱️ or Upload a Data File',
+        type = list(FILE_FORMATS),
     )
+
+    server_files = list_server_files()
+    selected_server_file = 'None'
+    if server_files:
+        selected_server_file = st.selectbox(
+            f'🅲 or Open a File from `{DATA_DIR}/`',
+            ['None'] + server_files,
+        )
     
-    st.warning("CSV should Less than 100k rows", icon = "💀")
+    st.caption(f"💾 Large CSVs are streamed in chunks with compact dtypes (up to {MEMORY_BUDGET / 1024 ** 3:.0f} GB in memory)")
+    st.caption("🧱 Parquet / Feather / Arrow files only load the selected columns")
+
+    # Engine running the filter, value-count & ANOVA queries: pandas on the loaded frame, or a lazy scan of the file
+    query_engines = available_engines()
+    query_engine = st.selectbox(
+        '⚙️ Query Engine',
+        query_engines,
+        index = query_engines.index(DEFAULT_QUERY_ENGINE) if DEFAULT_QUERY_ENGINE in query_engines else 0,
+        key = 'query_engine',
+        help = "DuckDB / Polars scan the whole file with predicate & projection pushdown, multithreaded, "
+               "instead of filtering and grouping the loaded frame (Filter & View, Value Counts, ANOVA)",
+    )
+
+    # Resolve the file to read: raw bytes of an upload, or a path that gets memory-mapped
+    file_format, source, source_key = None, None, None
+    if selected_dataset != 'None':
+        pass
+    elif uploaded_file is not None:
+        file_format = detect_format(uploaded_file.name)
+        source = uploaded_file.getvalue()
+        source_key = upload_fingerprint(uploaded_file)
+    elif selected_server_file != 'None':
+        source = os.path.join(DATA_DIR, selected_server_file)
+        file_format = detect_format(source)
+        source_key = server_file_fingerprint(source)
+
+    # Column projection for columnar files: only the selected columns are materialized
+    projected_columns = None
+    if file_format in COLUMNAR_FORMATS:
+        schema_columns = read_schema(source, file_format).names
+        projected_columns = st.multiselect('Columns to load', schema_columns, default = schema_columns)
+        if not projected_columns or projected_columns == schema_columns:
+            projected_columns = None
     #------------------------------------------------------------------------------------------------------#
 
+# Loaded frames are shared by all sessions & evicted by count and memory size
+@st.cache_resource
+def get_dataset_cache() -> 'DatasetCache':
+    clear_spills()  # uploads spilled by a previous run of the app, which no cache entry owns anymore
+    return DatasetCache(max_entries = 8, max_bytes = 2 * 1024 ** 3)
+
+def load_dataset(dataset_cache, selected_dataset, file_format, source, source_key, projected_columns):
+    # Key by dataset name or by content hash of the file, so a rerun never re-parses the same data
+    if selected_dataset != 'None':
+        fingerprint = f"seaborn:{selected_dataset}"
+        return fingerprint, dataset_cache.get_or_load(fingerprint, lambda: load_seaborn_dataset(selected_dataset))
+    if source is None:
+        return None, None
+
+    fingerprint = f"{file_format}:{source_key}"
+    if projected_columns is not None:
+        fingerprint += f":{fingerprint_bytes(chr(31).join(projected_columns).encode())[:12]}"
+    if fingerprint in dataset_cache:
+        return fingerprint, dataset_cache.get(fingerprint)
+
+    if file_format in COLUMNAR_FORMATS:
+        df = read_columnar(source, file_format, columns = projected_columns)
+    else:
+        # A server-side CSV is parsed straight from its path, chunk by chunk, never held in memory as a whole
+        progress_bar = st.progress(0.0, text = "Parsing CSV ...")
+        df = read_csv_chunked(source, progress = lambda fraction: progress_bar.progress(fraction, text = f"Parsing CSV ... {fraction:.0%}"))
+        progress_bar.empty()
+    return fingerprint, dataset_cache.put(fingerprint, df)
+
 # Load the selected dataset or uploaded file
+with perf.stage('load'):
+    dataset_fingerprint, df = load_dataset(get_dataset_cache(), selected_dataset, file_format, source, source_key, projected_columns)
 if selected_dataset != 'None':
-    df = sns.load_dataset(selected_dataset)
     st.success(f"✅ Have Loaded <`{selected_dataset}`> dataset from Seaborn!")
-elif uploaded_file is not None:
-    df = pd.read_csv(uploaded_file)
-    st.success("✅ CSV file uploaded successfully!")
-else:
-    df = None
+elif df is not None:
+    st.success(f"✅ {file_format.upper()} file loaded successfully! ({len(df):,} rows × {df.shape[1]} columns)")
+    if df.attrs.get('truncated'):
+        st.warning("CSV is larger than the memory budget, only the first rows were loaded", icon = "💀")
 #------------------------------------------------------------------------------------------------------#
 
 st.subheader("🎮 Switch Tab")
 
-# Option Menu
+# Option Menu (the Performance tab only shows up when switched on in the sidebar)
+with st.sidebar:
+    st.divider()
+    show_performance = st.toggle('⏱️ Show Performance tab', value = False, key = 'show_performance')
 with st.container():
     selected = option_menu(
         menu_title = None,
-        options = ["Info", "Summary", "Plot", "Dashboard"],
-        icons = ["info-square-fill", "list-stars", "bar-chart-line-fill", "grid-1x2-fill"],
+        options = ["Info", "Summary", "Plot", "Dashboard"] + (["Performance"] if show_performance else []),
+        icons = ["info-square-fill", "list-stars", "bar-chart-line-fill", "grid-1x2-fill"] + (["speedometer2"] if show_performance else []),
         orientation = 'horizontal'
     )
 
+# One scan per dataset: dtype classes, null counts, cardinalities & value counts shared by every tab
+@st.cache_resource(max_entries = 16)
+def get_profile(dataset_fingerprint, _df) -> 'DatasetProfile':
+    return build_profile(_df)
+
+# Value -> row positions index of a column, built lazily the first time the column is filtered on
+# and attached to the dataset's cache entry, so it is evicted with the frame
+def get_column_index(dataset_fingerprint, column, _df) -> 'ColumnIndex':
+    return get_dataset_cache().attachment(dataset_fingerprint, ('column_index', column), lambda: ColumnIndex(_df[column]))
+
+# describe()-like table of the numeric columns: one streaming pass with sketched quantiles unless `exact`
+@st.cache_resource(max_entries = 16)
+def get_numeric_summary(dataset_fingerprint, columns, exact, _df, _source = None) -> pd.DataFrame:
+    if exact:
+        return _df[list(columns)].describe(list(SUMMARY_PERCENTILES))
+    if _source is not None:
+        # The CSV did not fit in memory: stream the whole file again instead of the loaded rows
+        return summarize_chunks(chunk[list(columns)] for chunk in iter_csv_chunks(_source))
+    return summarize_chunks(frame_chunks(_df[list(columns)]))
+
+# DuckDB / Polars scan of the dataset file (or of the loaded frame for Seaborn datasets), one per dataset & engine,
+# attached to the dataset's cache entry like the spilled copy of an upload: both go away when the frame is evicted
+def get_query_backend(dataset_fingerprint, engine, file_format, _source, _df) -> 'QueryBackend':
+    def open_query_backend():
+        source = _source
+        if source is None:
+            return open_backend(engine, _df)
+        if isinstance(source, bytes):
+            # Uploads only live in memory: write them out once so the engine can scan them as a file
+            spilled = get_dataset_cache().attachment(dataset_fingerprint, 'spilled_upload',
+                                                     lambda: spill_upload(_source, fingerprint_bytes(dataset_fingerprint.encode()), file_format))
+            source = spilled.path
+        # The columns loaded as strings stay strings in the engine's CSV scan, so filters & counts see the same labels
+        return open_backend(engine, source, file_format, csv_kinds(_df))
+    try:
+        return get_dataset_cache().attachment(dataset_fingerprint, ('query_backend', engine), open_query_backend)
+    except Exception as error:
+        # A file the engine cannot scan: the queries run on the loaded frame with pandas instead
+        st.warning(f"{engine} cannot scan this file ({type(error).__name__}: {error}), falling back to pandas", icon = "⚠️")
+        return None
+
+# Sorted row order of a column, shared by every page of every grid showing the dataset
+# and attached to the dataset's cache entry, so it is evicted with the frame
+def get_sort_order(dataset_fingerprint, column, ascending, _df) -> np.ndarray:
+    return get_dataset_cache().attachment(dataset_fingerprint, ('sort_order', column, ascending), lambda: sort_positions(_df[column], ascending = ascending))
+
+# Arrow-encoded grid pages, so paging back and forth never re-slices the frame
+@st.cache_resource
+def get_page_cache() -> 'DatasetCache':
+    return DatasetCache(max_entries = 256, max_bytes = 256 * 1024 ** 2)
+
+def show_grid(grid_key, positions = None, selection = (), backend = None, conditions = (), n_rows = None):
+    # Paginated viewer: only the visible page of the selected columns is sent to the browser.
+    # With a query backend, pages of the rows matching `conditions` are queried from it instead of sliced from `df`
+    columns = df.columns.tolist()
+    shown_columns = st.multiselect('Columns to show', columns, default = columns, key = f'{grid_key}_columns') or columns
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
+    sort_column = col1.selectbox('Sort by', ['(row order)'] + columns, key = f'{grid_key}_sort')
+    descending = col2.toggle('Descending', value = False, key = f'{grid_key}_descending')
+    page_size = col3.selectbox('Rows per page', PAGE_SIZES, index = PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key = f'{grid_key}_page_size')
+
+    if n_rows is None:
+        n_rows = len(df) if positions is None else len(positions)
+    n_pages = page_count(n_rows, page_size)
+    # The page is kept in the session state, clamped to the last page of a shorter result; the widget starts on its min_value
+    if st.session_state.get(f'{grid_key}_page', 1) > n_pages:
+        st.session_state[f'{grid_key}_page'] = n_pages
+    page = col4.number_input(f'Page (of {n_pages:,})', min_value = 1, max_value = n_pages, key = f'{grid_key}_page') - 1
+
+    key = (dataset_fingerprint, backend and backend.engine, grid_key, tuple(selection), sort_column, descending, tuple(shown_columns), page_size, page)
+    table = get_page_cache().get(key)
+    if table is None and backend is not None:
+        with perf.stage(f'{grid_key}: query page ({backend.engine})'):
+            table = get_page_cache().put(key, backend.page(list(conditions), shown_columns, None if sort_column == '(row order)' else sort_column,
+                                                           descending, page * page_size, page_size))
+    elif table is None:
+        with perf.stage(f'{grid_key}: sort & slice page'):
+            order = positions
+            if sort_column != '(row order)':
+                order = get_sort_order(dataset_fingerprint, sort_column, not descending, df)
+                if positions is not None:
+                    order = restrict_order(order, positions, len(df))
+            table = get_page_cache().put(key, arrow_page(df, page_rows(order, len(df), page, page_size), shown_columns))
+    with perf.stage(f'{grid_key}: st.dataframe'):
+        st.dataframe(table)
+    start = page * page_size
+    st.caption(f"Rows {min(start + 1, n_rows):,}–{min(start + page_size, n_rows):,} of {n_rows:,} · {len(shown_columns)} of {len(columns)} columns")
+
+# Category codes, numeric vectors & group statistics of the Plot tabs, memoized node by node for each dataset.
+# The graph is attached to the dataset's cache entry: it shares its memory budget and is evicted with the frame
+def get_artifacts(dataset_fingerprint, _df) -> 'ArtifactGraph':
+    return get_dataset_cache().attachment(dataset_fingerprint, 'artifacts', lambda: ArtifactGraph(_df))
+
+# Headless analyses, memoized one by one
+@st.cache_resource(max_entries = 64)
+def get_anova_report(dataset_fingerprint, category, numeric, engine, _df, _backend) -> 'AnovaReport':
+    return anova_report(_df, category, numeric, backend = _backend)
+
+@st.cache_resource(max_entries = 32)
+def get_correlation_report(dataset_fingerprint, columns, method, sample_rows, cluster, top_k, _df) -> 'CorrelationReport':
+    return correlation_report(_df, list(columns), method = method, sample_rows = sample_rows, cluster = cluster, top_k = top_k)
+
+# Numeric columns with more distinct values than this are filtered by range instead of by value
+RANGE_FILTER_MIN_LEVELS = 20
+
+# PyGWalker dashboards: the directory of the per-dataset chart specs
+PYG_SPEC_DIR = os.environ.get('EDA_PYG_SPEC_DIR', os.path.join('.cache', 'pygwalker'))
+
+# Rendered figures, keyed by dataset & widget state, so a rerun with the same selections skips matplotlib
+@st.cache_resource
+def get_figure_cache() -> 'DatasetCache':
+    return DatasetCache(max_entries = 128, max_bytes = 256 * 1024 ** 2)
+
+def run_requested(analysis, selections, label):
+    # Heavy analyses wait for an explicit click; the click is remembered per analysis until its selections change
+    runs = st.session_state.setdefault('analysis_runs', {})
+    selections = tuple(selections)
+    if runs.get(analysis) == selections:
+        return True
+    if st.button(label, key = f'run_{analysis}', type = 'primary'):
+        runs[analysis] = selections
+        st.session_state.setdefault('cancelled_jobs', {}).pop(analysis, None)
+        return True
+    return False
+
+def show_figure(plot_kind, selections, build):
+    # Keyed by dataset & selections: the tabs never modify `df`, so those fully determine the figure
+    key = (dataset_fingerprint, plot_kind) + tuple(selections)
+    with perf.stage(f'{plot_kind}: draw & render'):
+        image = cached_render(get_figure_cache(), key, build)
+    with perf.stage(f'{plot_kind}: st.image'):
+        st.image(image, width = 'stretch')
+
+# Worker processes for the heavy analyses, shared by every session: the script thread only polls them
+@st.cache_resource
+def get_job_runner() -> 'JobRunner':
+    return JobRunner(initializer = apply_theme)
+
+# Optional preload hook (EDA_PRELOAD=1): once per process, import the plotting stack & PyGWalker and start
+# the worker processes in the background, so neither the first plot nor the first job waits for them
+@st.cache_resource
+def start_preload() -> 'threading.Thread':
+    get_job_runner().warm_up(preload)  # only spawns the workers; they import in parallel with this process
+    thread = threading.Thread(target = preload, args = (('pygwalker.api.streamlit',),), name = 'eda-preload', daemon = True)
+    thread.start()
+    return thread
+
+if os.environ.get('EDA_PRELOAD') == '1':
+    start_preload()
+
+def job_slot(analysis):
+    return (st.session_state.setdefault('session_key', uuid.uuid4().hex), analysis)
+
+def cancel_job(analysis, key):
+    get_job_runner().cancel(job_slot(analysis))
+    st.session_state.setdefault('cancelled_jobs', {})[analysis] = key
+    st.session_state.setdefault('analysis_runs', {}).pop(analysis, None)
+
+def run_job(analysis, key, fn, make_arguments):
+    # Run `fn(*make_arguments())` in the worker pool with a progress bar; a new selection reruns the script and cancels the stale job
+    cancelled = st.session_state.setdefault('cancelled_jobs', {})
+    if cancelled.get(analysis) == key:
+        st.caption("✖️ Cancelled")
+        if not st.button('🔁 Run again', key = f'restart_{analysis}'):
+            return None
+        del cancelled[analysis]
+
+    with perf.stage(f'{analysis}: submit job'):
+        job = get_job_runner().submit_lazy(job_slot(analysis), key, fn, lambda: (tuple(make_arguments()), {}))
+    if not job.done():
+        with perf.stage(f'{analysis}: wait for worker'):
+            placeholder = st.empty()
+            with placeholder.container():
+                progress_bar = st.progress(0.0, text = "Queued ...")
+                st.button('✖️ Cancel', key = f'cancel_{analysis}', on_click = cancel_job, args = (analysis, key))
+            while not job.done():
+                fraction, text = job.progress()
+                progress_bar.progress(min(fraction, 1.0), text = text or "Running ...")
+                time.sleep(0.2)
+            placeholder.empty()
+
+    if job.cancelled():
+        return None
+    if job.exception() is not None:
+        st.error(f"⛔ {type(job.exception()).__name__}: {job.exception()}")
+        return None
+    return job.result()
+
+def show_figure_job(plot_kind, selections, draw, make_arguments):
+    # Same as show_figure, with the figure drawn & rendered by `draw(*make_arguments())` in a worker process
+    key = (dataset_fingerprint, plot_kind) + tuple(selections)
+    image = run_job(plot_kind, key, render_job, lambda: (draw,) + tuple(make_arguments()))
+    if image is not None:
+        with perf.stage(f'{plot_kind}: st.image'):
+            st.image(image, width = 'stretch')
+
 # Proceed only if a dataset is loaded
 if df is not None:
+    with perf.stage('profile (dtypes & counts)'):
+        profile = get_profile(dataset_fingerprint, df)
+    numeric_columns = profile.numeric_columns
+    categorical_columns = profile.categorical_columns
+    artifacts = get_artifacts(dataset_fingerprint, df)
+    backend = None
+    if query_engine != 'pandas':
+        with perf.stage(f'open {query_engine} scan'):
+            backend = get_query_backend(dataset_fingerprint, query_engine, file_format, source, df)
+
     if selected == "Info":
         if selected_dataset != 'None':
             tab00, tab01 = st.tabs(['⌈ ⁰ Dataset Intro ⌉', 
@@ -172,409 +482,514 @@ if df is not None:
           st.error('This Tab is Only Available for Seaborn Dataset', icon = "⛔")
     #------------------------------------------------------------------------------------------------------#
     if selected == "Summary":
+        # Lazy tabs: only the selected tab runs its code on a rerun
         tab1, tab2 = st.tabs(['⌈ ¹ Dtypes Info ⌉', 
-                              '⌈ ² Filter & View ⌉'])
-        with tab1:
-            st.warning(" Summary & Data types of the Dataset ", icon = "🕹️")
-            st.info('Here is the Dataset', icon = "1️⃣")
-            st.dataframe(df)
+                              '⌈ ² Filter & View ⌉'],
+                             key = 'summary_tabs',
+                             on_change = 'rerun',
+                             )
+        if tab1.open:
+            with tab1:
+                st.warning(" Summary & Data types of the Dataset ", icon = "🕹️")
+                st.info('Here is the Dataset', icon = "1️⃣")
+                show_grid('grid_tab1')
             
-            st.divider()
+                st.divider()
 
-            st.info('Data Type of Variables', icon = "2️⃣")
+                st.info('Data Type of Variables', icon = "2️⃣")
             
-            # Data types overview
-            data_types = df.dtypes.to_frame('Types')
-            data_types['Types'] = data_types['Types'].astype(str)  # Convert to strings for sorting
-            st.write(data_types.sort_values('Types'))
+                # Data types overview
+                st.write(profile.overview().sort_values('Types'))
             
-            st.divider()
+                st.divider()
         
-            # Only describe numeric columns
-            st.info('Statistic of Numeric Variables', icon = "3️⃣")
-            numeric_df = df.select_dtypes(include = ['number'])
-            if not numeric_df.empty:
-                st.write(numeric_df.describe([.25, .75, .9, .95]))
-            else:
-                st.write("No numeric columns to describe.")
+                # Only describe numeric columns
+                st.info('Statistic of Numeric Variables', icon = "3️⃣")
+                if numeric_columns:
+                    exact_summary = st.toggle('Exact quantiles (sorts every column)', value = False, key = 'exact_summary_tab1')
+                    truncated = bool(df.attrs.get('truncated')) and file_format == 'csv'
+                    with perf.stage('tab1: numeric summary'):
+                        summary = get_numeric_summary(dataset_fingerprint, tuple(numeric_columns), exact_summary, df,
+                                                      _source = source if truncated and not exact_summary else None)
+                    st.write(summary)
+                    if summary.attrs.get('approximate'):
+                        st.caption("ℹ️ Count, mean, std, min & max are exact; quantiles are approximate (streaming sketch)")
+                    if truncated:
+                        st.caption("ℹ️ " + ("Exact statistics cover the loaded rows only" if exact_summary else "Statistics cover the whole CSV file, not only the loaded rows"))
+                else:
+                    st.write("No numeric columns to describe.")
         #------------------------------------------------------------------------------------------------------#
-        with tab2:
-            st.warning(" Filter & View on Specific Column & Value ", icon = "🕹️")
-            # Filter Data Section
-            columns = df.columns.tolist()
-
-            # Unique keys for selectbox
-            selected_column = st.selectbox(
-                'Select column to filter by',
-                columns,
-                key = 'column_selector_tab2',
-            )
-        
-            if selected_column:
-                # Show Filtered Data
-                unique_values = df[selected_column].dropna().unique()  # Drop NaNs for filtering
-                unique_values = [str(value) for value in unique_values]  # Ensure all values are string
-                selected_value = st.selectbox(
-                    'Select value',
-                    unique_values,
-                    key = 'value_selector_tab2',
+        if tab2.open:
+            with tab2:
+                st.warning(" Filter & View on Specific Column & Value ", icon = "🕹️")
+                # Filter Data Section
+                columns = df.columns.tolist()
+
+                # Unique keys for multiselect
+                filter_columns = st.multiselect(
+                    'Select columns to filter by',
+                    columns,
+                    default = columns[:1],
+                    key = 'column_selector_tab2',
                 )
 
-                st.divider()
+                # One condition per column: a value range for continuous numerics, a set of values otherwise
+                conditions = []
+                for selected_column in filter_columns:
+                    column_profile = profile[selected_column]
+                    value_counts = column_profile.value_counts
+                    if column_profile.kind == 'numeric' and (value_counts is None or column_profile.cardinality > RANGE_FILTER_MIN_LEVELS):
+                        low, high = (getattr(value, 'item', lambda: value)() for value in (column_profile.min, column_profile.max))
+                        if low == high:
+                            continue
+                        selected_range = st.slider(
+                            f'Select range of {selected_column}',
+                            low, high, (low, high),
+                            key = f'range_selector_tab2_{selected_column}',
+                        )
+                        if selected_range != (low, high):
+                            conditions.append(Condition(selected_column, bounds = selected_range))
+                    else:
+                        if value_counts is None:  # Too many distinct values to keep in the profile
+                            value_counts = df[selected_column].value_counts()
+                        unique_values = [str(value) for value in value_counts.index]  # Ensure all values are string
+                        selected_values = st.multiselect(
+                            f'Select values of {selected_column}',
+                            unique_values,
+                            default = unique_values[:1],
+                            key = f'value_selector_tab2_{selected_column}',
+                        )
+                        if selected_values:
+                            conditions.append(Condition(selected_column, values = selected_values))
+
+                if filter_columns:
+                    st.divider()
                 
-                # Filter DataFrame
-                st.info(f'Filtered Data of {selected_column} = {selected_value}', icon = "1️⃣")
-                filtered_df = df[df[selected_column].astype(str) == selected_value]
-                st.write("Filtered DataFrame:")
-                st.write(filtered_df)
+                    # Filter DataFrame through the per-column indexes: O(matches) instead of a full scan
+                    # (or count the matches with the query engine, which then serves the pages too)
+                    with perf.stage('tab2: filter'):
+                        filtered = filter_rows(df, conditions, get_index = lambda column: get_column_index(dataset_fingerprint, column, df), backend = backend)
+                    st.info(f'Filtered Data of {filtered.description}', icon = "1️⃣")
+                    st.write(f"Filtered DataFrame: {filtered.n_rows:,} rows")
+                    if backend is not None and df.attrs.get('truncated'):
+                        st.caption(f"ℹ️ {backend.engine} queries cover the whole file, not only the loaded rows")
+                    show_grid('grid_tab2', filtered.positions, selection = filtered.key,
+                              backend = backend, conditions = filtered.conditions, n_rows = filtered.n_rows)
                 
-                st.divider()
+                    st.divider()
                 
-                # Calculate Data Groupby Selected-Column
-                st.info(f'Value Count Groupby {selected_column}', icon = "2️⃣")
-                group_stats = df.groupby(selected_column).size().reset_index(name = 'counts')
-                group_stats.set_index(selected_column, inplace = True)
-                st.write(group_stats.sort_values('counts', ascending = False))
+                    # Value counts of the filtering columns, read from the profile
+                    st.info(f'Value Count Groupby {", ".join(filter_columns)}', icon = "2️⃣")
+                    for selected_column in filter_columns:
+                        st.write(value_count_table(df, selected_column, profile, backend))
     #------------------------------------------------------------------------------------------------------#
     if selected == "Plot":
+        # The plotting stack is only imported once a Plot tab is opened; the theme is applied once per process
+        apply_theme()
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         tab3, tab4, tab5, tab6, tab7 = st.tabs(['⌈ ³ ANOVA & Violin Plot ⌉', 
                                                 '⌈ ⁴ Area & Point Plot ⌉', 
                                                 '⌈ ⁵ Density & Scatter Plot ⌉', 
                                                 '⌈ ⁶ VIF & Corr Matrix ⌉',
-                                                '⌈ ⁷ Pair Plot ⌉'])
+                                                '⌈ ⁷ Pair Plot ⌉'],
+                                               key = 'plot_tabs',
+                                               on_change = 'rerun',
+                                               )
         #------------------------------------------------------------------------------------------------------#
-        with tab3:
-            st.warning(" Testing the Statistically Significant Differences ", icon = "🕹️")
+        if tab3.open:
+            with tab3:
+                st.warning(" Testing the Statistically Significant Differences ", icon = "🕹️")
             
-            # Filter numeric and categorical columns
-            numeric_columns = df.select_dtypes(include = ['number']).columns.tolist()
-            categorical_columns = df.select_dtypes(include = ['object', 'category']).columns.tolist()
-
-            if numeric_columns and categorical_columns:
-                # Allow user to select a categorical column and a numeric column
-                selected_category_column = st.selectbox('Select Categorical Column',
-                                                        categorical_columns,
-                                                        key = 'category_selector_tab3',
-                                                       )
-                selected_numeric_column = st.selectbox('Select Numeric Column',
-                                                       numeric_columns,
-                                                       key = 'numeric_selector_tab3',
-                                                      )
+                # Numeric and categorical columns come from the dataset profile
+                if numeric_columns and categorical_columns:
+                    # Allow user to select a categorical column and a numeric column
+                    selected_category_column = st.selectbox('Select Categorical Column',
+                                                            categorical_columns,
+                                                            key = 'category_selector_tab3',
+                                                           )
+                    selected_numeric_column = st.selectbox('Select Numeric Column',
+                                                           numeric_columns,
+                                                           key = 'numeric_selector_tab3',
+                                                          )
 
-                st.divider()
-
-                if selected_category_column and selected_numeric_column:
-                    # #0 Check the Anova Test
-                    # Remove rows with missing values in the selected columns
-                    df = df.dropna(subset = [selected_numeric_column, selected_category_column])
-
-                    # Ensure the data columns are of the correct type
-                    df[selected_numeric_column] = pd.to_numeric(df[selected_numeric_column], errors = 'coerce')
-                    df[selected_category_column] = df[selected_category_column].astype(str)
-
-                    # Retrieve unique category values and group data by categories
-                    unique_category_values = df[selected_category_column].unique().tolist()
-                    category_groups = [df[df[selected_category_column] == category][selected_numeric_column] for category in unique_category_values]
+                    st.divider()
 
-                    # Check if each group has sufficient data
-                    for i, group in enumerate(category_groups):
-                        if len(group) < 2:
-                            st.error(f"⛔ Group '{unique_category_values[i]}' does not have enough data for ANOVA analysis!")
+                    if selected_category_column and selected_numeric_column:
+                        # #0 Check the Anova Test
+                        # Sizes, moments & quantiles of every group from the memoized category codes & numeric vector
+                        # (only the side whose selection changed is recomputed), then the F-test
+                        with perf.stage('tab3: group statistics & ANOVA'):
+                            if backend is None:
+                                anova = artifacts.anova(selected_category_column, selected_numeric_column)
+                            else:
+                                anova = get_anova_report(dataset_fingerprint, selected_category_column, selected_numeric_column,
+                                                         query_engine, df, backend)
+
+                        if anova.problem:
+                            st.error(f"⛔ {anova.problem}")
                             st.stop()
-                        if group.var() == 0:
-                            st.error(f"⛔ Group '{unique_category_values[i]}' has constant values, making ANOVA analysis impossible!")
-                            st.stop()
-
-                    # Perform ANOVA
-                    anova_result = f_oneway(*category_groups)
+                        anova_result = anova.result
 
-                    # Output the results
-                    st.info(f'One-way ANOVA between {selected_category_column} on {selected_numeric_column}', icon = "ℹ️")
-                    st.write(f"ANOVA F-statistic: {anova_result.statistic:.3f}")
-                    st.write(f"ANOVA p-value: {anova_result.pvalue:.3f}")
+                        # Output the results
+                        st.info(f'One-way ANOVA between {selected_category_column} on {selected_numeric_column}', icon = "ℹ️")
+                        st.write(f"ANOVA F-statistic: {anova_result.statistic:.3f}")
+                        st.write(f"ANOVA p-value: {anova_result.pvalue:.3f}")
 
-                    if anova_result.pvalue < 0.05:
-                        st.success("✅ The differences between groups are statistically significant (p < 0.05).")
-                    else:
-                        st.warning("⛔ The differences between groups are NOT statistically significant (p >= 0.05).")
+                        if anova.significant:
+                            st.success("✅ The differences between groups are statistically significant (p < 0.05).")
+                        else:
+                            st.warning("⛔ The differences between groups are NOT statistically significant (p >= 0.05).")
                     
-                    st.divider()
+                        st.divider()
                     
-                    # Violin plot
-                    st.info(f'Violin plot of {selected_numeric_column} by {selected_category_column}', icon = "ℹ️")
-                    fig, ax = plt.subplots(figsize = (12, 6))
-                    sns.violinplot(
-                        data = df,
-                        x = selected_category_column,
-                        y = selected_numeric_column,
-                        palette = "muted",
-                        ax = ax,
-                    )
-                    ax.set_xlabel(selected_category_column)
-                    ax.set_ylabel(selected_numeric_column)
+                        # Violin plot
+                        st.info(f'Violin plot of {selected_numeric_column} by {selected_category_column}', icon = "ℹ️")
+                        # Plots read the two selected columns in place; rows missing either value are skipped, not dropped from `df`
+                        n_rows = int(artifacts.group_stats(selected_category_column, selected_numeric_column).count.sum())
+                        large_mode = is_large(n_rows)
+                        if large_mode:
+                            # Large-n mode: FFT-binned densities instead of one exact KDE per group
+                            st.caption(f"ℹ️ {n_rows:,} rows: violins are drawn from binned kernel densities")
+
+                        def build_violin_plot():
+                            fig, ax = plt.subplots(figsize = (12, 6))
+                            if large_mode:
+                                binned_violinplot(df, x = selected_category_column, y = selected_numeric_column, ax = ax, palette = "muted",
+                                                  groups = artifacts.groups(selected_category_column, selected_numeric_column))
+                            else:
+                                sns.violinplot(
+                                    x = df[selected_category_column],
+                                    y = df[selected_numeric_column],
+                                    hue = df[selected_category_column],
+                                    legend = False,
+                                    palette = "muted",
+                                    ax = ax,
+                                )
+                            ax.set_xlabel(selected_category_column)
+                            ax.set_ylabel(selected_numeric_column)
+                            return fig
                     
-                    st.pyplot(fig)
+                        show_figure('violin', (selected_category_column, selected_numeric_column), build_violin_plot)
 
-                    st.divider()
+                        st.divider()
                     
-                    # Calculate Statistics
-                    st.info(f'Statistics of {selected_numeric_column} by {selected_category_column}', icon = "ℹ️")
-                    grouped_stats = df.groupby(selected_category_column)[selected_numeric_column].agg(count = 'count',
-                                                                                                      mean = 'mean',
-                                                                                                      std = 'std',
-                                                                                                      q1 = lambda x: x.quantile(0.25),
-                                                                                                      median = 'median',
-                                                                                                      q3 = lambda x: x.quantile(0.75),
-                                                                                                      ).reset_index()
-
-                    grouped_stats[['mean', 'std', 'q1', 'median', 'q3']] = grouped_stats[['mean', 'std', 'q1', 'median', 'q3']].round(3)
-                
-                    # Rename Columns of Statistics
-                    grouped_stats.rename(columns = {'count': 'Count',
-                                                    'mean': 'Mean',
-                                                    'std': 'STD',
-                                                    'q1': 'Q1','median': 'Q2',
-                                                    'q3': 'Q3',
-                                                    },
-                                         inplace = True,
-                                         )
-                    grouped_stats.set_index(selected_category_column, inplace = True)
-                    st.write(grouped_stats.T)
-            else:
-                st.write("Ensure your dataset contains both numeric and categorical columns.", icon = "❗")
-        #------------------------------------------------------------------------------------------------------#
-        with tab4:
-            st.warning(" Realize the Concentration of Data points ", icon = "🕹️")
-            
-            # Filter numeric and categorical columns
-            numeric_columns = df.select_dtypes(include = ['number']).columns.tolist()
-            categorical_columns = df.select_dtypes(include = ['object', 'category']).columns.tolist()
-
-            if numeric_columns and categorical_columns:
-                # Allow user to select a categorical column and a numeric column
-                selected_category_column = st.selectbox('Select Categorical Column',
-                                                        categorical_columns,
-                                                        key = 'category_selector_tab4',
-                                                        )
-                selected_numeric_column = st.selectbox('Select Numeric Column',
-                                                       numeric_columns,
-                                                       key = 'numeric_selector_tab4',
-                                                       )
-
-                if selected_category_column and selected_numeric_column:
-                    df = df.dropna(subset = [selected_numeric_column, selected_category_column])
-                    # Displot
-                    st.info(f'Area Distribution of {selected_numeric_column} by {selected_category_column}', icon = "ℹ️")
-                    sns_displot = sns.displot(data = df,
-                                              x = selected_numeric_column,
-                                              hue = selected_category_column,
-                                              kind = "kde",
-                                              height = 6,
-                                              aspect = 1.5, # ratio of width:height = aspect
-                                              multiple = "fill",
-                                              clip = (0, None),
-                                              palette = "ch:rot = -.25, hue = 1, light = .75",
-                                              )
-
-                    st.pyplot(sns_displot.fig)
-
-                    st.divider()
-                    st.info(f'Point Average Plot of {selected_numeric_column} across different {selected_category_column}', icon = "ℹ️")
-                    g = sns.PairGrid(data = df, 
-                                     y_vars = selected_numeric_column,
-                                     x_vars = [selected_category_column],
-                                     height = 5, 
-                                     aspect = 2.0
-                                    )
-                    g.map(sns.pointplot, color = "xkcd:greenish")
-                    st.pyplot(g)
-            else:
-                st.write("Ensure your dataset contains both numeric and categorical columns.", icon = "❗")
+                        # Calculate Statistics
+                        st.info(f'Statistics of {selected_numeric_column} by {selected_category_column}', icon = "ℹ️")
+                        st.write(anova.table().T)
+                else:
+                    st.write("Ensure your dataset contains both numeric and categorical columns.", icon = "❗")
         #------------------------------------------------------------------------------------------------------#
-        with tab5:
-            st.warning(" Brief Realization on Correlation by Categorical Var Between Numeric Var ", icon = "🕹️")
+        if tab4.open:
+            with tab4:
+                st.warning(" Realize the Concentration of Data points ", icon = "🕹️")
             
-            # Filter numeric columns
-            numeric_columns = df.select_dtypes(include = ['number']).columns.tolist()
-
-            # Filter categorical columns
-            categorical_columns = df.select_dtypes(include = ['object', 'category']).columns.tolist()
-
-            if numeric_columns and categorical_columns:
-                # Allow user to select a categorical column
-                selected_category_column = st.selectbox('Select Categorical Column',
-                                                        categorical_columns,
-                                                        key = 'category_selector_tab5',
-                                                        )
-                unique_category_values = df[selected_category_column].unique().tolist()
-
-                # Allow user to select numeric columns for X and Y axes
-                st.info(" X & Y Should be Different ", icon = "ℹ️")
-                selected_x = st.selectbox('Select X-axis column',
-                                          numeric_columns,
-                                          key = 'x_axis_selector_tab5',
+                # Numeric and categorical columns come from the dataset profile
+                if numeric_columns and categorical_columns:
+                    # Allow user to select a categorical column and a numeric column
+                    selected_category_column = st.selectbox('Select Categorical Column',
+                                                            categorical_columns,
+                                                            key = 'category_selector_tab4',
+                                                            )
+                    selected_numeric_column = st.selectbox('Select Numeric Column',
+                                                           numeric_columns,
+                                                           key = 'numeric_selector_tab4',
+                                                           )
+
+                    if selected_category_column and selected_numeric_column:
+                        # Displot (rows missing either value are skipped by the plots, `df` itself is left untouched)
+                        st.info(f'Area Distribution of {selected_numeric_column} by {selected_category_column}', icon = "ℹ️")
+                        n_rows = int(artifacts.group_stats(selected_category_column, selected_numeric_column).count.sum())
+                        large_mode = is_large(n_rows)
+                        if large_mode:
+                            # Large-n mode: binned densities & analytic intervals instead of per-row KDE / bootstrap
+                            st.caption(f"ℹ️ {n_rows:,} rows: areas come from binned kernel densities, intervals from group statistics")
+
+                        def build_area_plot():
+                            if large_mode:
+                                fig, ax = plt.subplots(figsize = (9, 6))
+                                binned_fill_kdeplot(df,
+                                                    x = selected_numeric_column,
+                                                    hue = selected_category_column,
+                                                    ax = ax,
+                                                    palette = "ch:rot = -.25, hue = 1, light = .75",
+                                                    clip = (0, None),
+                                                    groups = artifacts.groups(selected_category_column, selected_numeric_column),
+                                                    )
+                                return fig
+                            return sns.displot(x = df[selected_numeric_column],
+                                               hue = df[selected_category_column],
+                                               kind = "kde",
+                                               height = 6,
+                                               aspect = 1.5, # ratio of width:height = aspect
+                                               multiple = "fill",
+                                               clip = (0, None),
+                                               palette = "ch:rot = -.25, hue = 1, light = .75",
+                                               )
+
+                        show_figure('area', (selected_category_column, selected_numeric_column), build_area_plot)
+
+                        st.divider()
+                        st.info(f'Point Average Plot of {selected_numeric_column} across different {selected_category_column}', icon = "ℹ️")
+
+                        def build_point_plot():
+                            if large_mode:
+                                fig, ax = plt.subplots(figsize = (10, 5))
+                                pointplot_from_stats(artifacts.group_stats(selected_category_column, selected_numeric_column), ax = ax)
+                                ax.set_xlabel(selected_category_column)
+                                ax.set_ylabel(selected_numeric_column)
+                                return fig
+                            fig, ax = plt.subplots(figsize = (10, 5))
+                            sns.pointplot(x = df[selected_category_column],
+                                          y = df[selected_numeric_column],
+                                          color = "xkcd:greenish",
+                                          ax = ax,
                                           )
-                selected_y = st.selectbox('Select Y-axis column',
-                                          numeric_columns,
-                                          key = 'y_axis_selector_tab5',
-                                          )
-                if selected_x and selected_y:
-                    # Create subplots based on the number of unique category values
-                    num_categories = len(unique_category_values)
-                    cols = 2  # Maximum 2 plots per row
-                    rows = (num_categories + cols - 1) // cols  # Calculate rows needed
-
-                    # Initialize the figure
-                    fig, axes = plt.subplots(
-                    rows, cols,
-                    figsize = (12, 6 * rows),
-                    constrained_layout = True,
-                    )
-                    axes = axes.flatten()  # Flatten axes for easy iteration
-
-                    # Plot each category
-                    for i, category in enumerate(unique_category_values):
-                        ax = axes[i]
-                        filtered_data = df[df[selected_category_column] == category]
-                        sns.kdeplot(data = filtered_data,
-                                    x = selected_x,
-                                    y = selected_y,
-                                    fill = True,
-                                    cmap = "Greens",
-                                    ax = ax,
-                                    warn_singular = False,  # Suppress singular warnings
-                                    )
-                        ax.set_title(f'{selected_category_column}: {category}')
-                        ax.set_xlabel(selected_x)
-                        ax.set_ylabel(selected_y)
-
-                    # Hide unused subplots
-                    for i in range(num_categories, len(axes)):
-                        axes[i].axis('off')
-                    # Display the plot
-                    st.pyplot(fig)
+                            return fig
 
-                    st.divider()
-                  
-                    g = sns.lmplot(data = df,
-                                   x = selected_x, 
-                                   y = selected_y, 
-                                   hue = selected_category_column,
-                                   height = 5,
-                                   aspect = 1.5
-                                  )
-                    st.pyplot(g)
+                        show_figure('point', (selected_category_column, selected_numeric_column), build_point_plot)
+                else:
+                    st.write("Ensure your dataset contains both numeric and categorical columns.", icon = "❗")
         #------------------------------------------------------------------------------------------------------#
-        with tab6:
-            st.markdown('''
-                #### *Variance Inflation Factors(VIF) & Correlation Matrix Heatmap*
-            ''')
-            st.warning("Check the Multi-collinearity between Numeric Variables", icon = "🕹️")
+        if tab5.open:
+            with tab5:
+                st.warning(" Brief Realization on Correlation by Categorical Var Between Numeric Var ", icon = "🕹️")
             
-            # Filter numeric columns
-            numeric_columns = df.select_dtypes(include = ['number']).columns.tolist()
+                # Numeric and categorical columns come from the dataset profile
+                if numeric_columns and categorical_columns:
+                    # Allow user to select a categorical column
+                    selected_category_column = st.selectbox('Select Categorical Column',
+                                                            categorical_columns,
+                                                            key = 'category_selector_tab5',
+                                                            )
+                    # Categories ordered by frequency, so the panels of the density grid show the largest groups first
+                    panels = density_plan(df, selected_category_column, profile)
+
+                    # Allow user to select numeric columns for X and Y axes
+                    st.info(" X & Y Should be Different ", icon = "ℹ️")
+                    selected_x = st.selectbox('Select X-axis column',
+                                              numeric_columns,
+                                              key = 'x_axis_selector_tab5',
+                                              )
+                    selected_y = st.selectbox('Select Y-axis column',
+                                              numeric_columns,
+                                              key = 'y_axis_selector_tab5',
+                                              )
+                    if selected_x and selected_y:
+                        # Only these columns are shipped to the worker process (X and Y may be the same column)
+                        plot_columns = list(dict.fromkeys([selected_category_column, selected_x, selected_y]))
+                        large_mode = is_large(len(df))
+                        if large_mode:
+                            st.caption(f"ℹ️ {len(df):,} rows: densities are shown as hexagonal 2D histograms")
+
+                        # Top-N categories get a panel each, the rest is folded into one "other" panel
+                        if panels.folded:
+                            st.caption(f"ℹ️ {len(panels.shown) + len(panels.folded):,} categories: the {len(panels.shown)} most frequent get their own panel, "
+                                       f"the other {len(panels.folded):,} share the last one")
+
+                        # Display the plot, once asked for: one 2D density per category, drawn in a worker process
+                        if run_requested('density_grid', (dataset_fingerprint, selected_category_column, selected_x, selected_y), '▶️ Draw Density Plots'):
+                            show_figure_job('density_grid', (selected_category_column, selected_x, selected_y), density_grid,
+                                            lambda: (df[plot_columns], selected_category_column,
+                                                     selected_x, selected_y, panels.shown, large_mode, len(panels.folded)))
+
+                        st.divider()
+
+                        # Regression fits on a sample stratified by category when the frame is large
+                        if is_sampled(len(df)):
+                            st.caption(sample_note(len(df)))
+
+                        show_figure_job('lmplot', (selected_category_column, selected_x, selected_y), regression_grid,
+                                        lambda: (stratified_sample(df[plot_columns], by = selected_category_column),
+                                                 selected_category_column, selected_x, selected_y))
+        #------------------------------------------------------------------------------------------------------#
+        if tab6.open:
+            with tab6:
+                st.markdown('''
+                    #### *Variance Inflation Factors(VIF) & Correlation Matrix Heatmap*
+                ''')
+                st.warning("Check the Multi-collinearity between Numeric Variables", icon = "🕹️")
             
-            if numeric_columns:
-                # Put Numeric Var into Multi-Select
-                selected_columns = st.multiselect("Select `Numeric` columns:",
-                                                  numeric_columns,
-                                                  default = numeric_columns,  # default settings for select all numeric
-                                                  )
-                st.divider()
+                # Numeric columns come from the dataset profile
+                if numeric_columns:
+                    # Put Numeric Var into Multi-Select
+                    selected_columns = st.multiselect("Select `Numeric` columns:",
+                                                      numeric_columns,
+                                                      default = numeric_columns,  # default settings for select all numeric
+                                                      )
+                    st.divider()
                 
-                if selected_columns:
-                    # VIF: Variance Inflation Factors
-                    X = df[selected_columns].dropna()
-
-                    # Add an Intercept
-                    X = sm.add_constant(X)
-                    
-                    vif_data = pd.DataFrame()
-                    vif_data["feature"] = X.columns
-                    vif_data["VIF"] = [variance_inflation_factor(X.values, i) for i in range(X.shape[1])]
+                    if selected_columns:
+                        # VIF: Variance Inflation Factors, all at once from the inverse correlation matrix (with an Intercept)
+                        vif_sample_rows = None
+                        if len(df) > VIF_SAMPLE_ROWS and st.toggle(f'Estimate VIF on a sample of {VIF_SAMPLE_ROWS:,} rows', value = True):
+                            vif_sample_rows = VIF_SAMPLE_ROWS
+                        st.info(' Use Variance Inflation Factors(`VIF`) to check `Multi-collinearity` ', icon = "ℹ️")
+                        vif_data = run_job('vif', (dataset_fingerprint, 'vif', tuple(selected_columns), vif_sample_rows), variance_inflation_factors,
+                                           # only the selected columns (of the sampled rows) are sent; the moments are accumulated in the worker
+                                           lambda: (sample_frame(df[selected_columns], vif_sample_rows),))
+                        if vif_data is not None:
+                            st.write(vif_data)
+                        st.markdown('''
+                                    - VIF = 1: No multicollinearity.
+                                    - 1 < VIF < 5: Acceptable range.
+                                    - VIF ≥ 5 or 10: Severe multicollinearity; consider removing or combining features.
+                                    - VIF = inf: The column is constant or an exact linear combination of other columns.
+                        ''')
+                        st.divider()
+
+                        # Correlation options: method, row sampling, clustering & top-k highlighting
+                        n_pairs = len(selected_columns) * (len(selected_columns) - 1) // 2
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            correlation_method = st.selectbox('Correlation method', CORRELATION_METHODS, key = 'method_selector_tab6')
+                            corr_sample_rows = None
+                            if len(df) > VIF_SAMPLE_ROWS and st.toggle(f'Correlate a sample of {VIF_SAMPLE_ROWS:,} rows', value = True):
+                                corr_sample_rows = VIF_SAMPLE_ROWS
+                        with col2:
+                            cluster_columns = st.toggle('Reorder columns by hierarchical clustering',
+                                                        value = len(selected_columns) > ANNOT_MAX_COLUMNS,
+                                                        )
+                            top_k = st.number_input('Highlight only the k strongest pairs (0 = all)',
+                                                    min_value = 0,
+                                                    max_value = max(n_pairs, 0),
+                                                    value = 0 if n_pairs <= 190 else 50,
+                                                    )
+
+                        # Correlation matrix (one BLAS pass without NaNs, masked pairwise pass with NaNs), order, top pairs & mask
+                        with perf.stage('tab6: correlation'):
+                            correlation_data = get_correlation_report(dataset_fingerprint, tuple(selected_columns), correlation_method,
+                                                                      corr_sample_rows, cluster_columns, top_k, df)
+                        if correlation_method == 'kendall' and len(df) > KENDALL_SAMPLE_ROWS:
+                            st.caption(f"ℹ️ Kendall's tau is computed on a sample of {KENDALL_SAMPLE_ROWS:,} rows")
+                        correlation, mask, top_pairs = correlation_data.matrix, correlation_data.mask, correlation_data.pairs
+
+                        # Plot the heatmap; annotations only while the cells are large enough to read
+                        annotate = len(selected_columns) <= ANNOT_MAX_COLUMNS
+                        def build_heatmap():
+                            size = max(12, 0.3 * len(selected_columns))
+                            fig, ax = plt.subplots(figsize = (size, size * 0.75))
+                            sns.heatmap(correlation,
+                                        mask = mask,  # Apply the mask to hide the upper triangle
+                                        annot = annotate,
+                                        cmap = "coolwarm",
+                                        vmin = -1,
+                                        vmax = 1,
+                                        fmt = ".3f",
+                                        ax = ax,
+                                        )
+                            ax.set_title("Correlation Matrix Heatmap (Lower Triangle Only)")
+                            return fig
                     
-                    st.info(' Use Variance Inflation Factors(`VIF`) to check `Multi-collinearity` ', icon = "ℹ️")
-                    st.write(vif_data)
-                    st.markdown('''
-                                - VIF = 1: No multicollinearity.
-                                - 1 < VIF < 5: Acceptable range.
-                                - VIF ≥ 5 or 10: Severe multicollinearity; consider removing or combining features.
-                    ''')
-                    st.divider()
+                        st.info(' Use `Correlation Matrix Heatmap` for further checking ', icon = "ℹ️")
+                        show_figure('heatmap', (tuple(selected_columns), correlation_method, corr_sample_rows, cluster_columns, top_k), build_heatmap)
 
-                    # Compute correlation matrix
-                    correlation_matrix = df[selected_columns].corr()
-        
-                    # Mask to hide the upper triangle
-                    mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
-        
-                    # Plot the heatmap
-                    fig, ax = plt.subplots(figsize = (12, 9))
-                    sns.heatmap(correlation_matrix,
-                                mask = mask,  # Apply the mask to hide the upper triangle
-                                annot = True,
-                                cmap = "coolwarm",
-                                fmt = ".3f",
-                                ax = ax,
-                                )
-                    ax.set_title("Correlation Matrix Heatmap (Lower Triangle Only)")
-                    
-                    st.info(' Use `Correlation Matrix Heatmap` for further checking ', icon = "ℹ️")
-                    st.pyplot(fig)
+                        st.info(f' Strongest {len(top_pairs)} Correlated Pairs ', icon = "ℹ️")
+                        st.write(top_pairs)
+                    else:
+                        st.warning("No columns selected. Please select at least one numeric column.", icon = "⚠️")
                 else:
-                    st.warning("No columns selected. Please select at least one numeric column.", icon = "⚠️")
-            else:
-                st.error("Your dataset does not contain any numeric columns.", icon = "❗")
+                    st.error("Your dataset does not contain any numeric columns.", icon = "❗")
         #------------------------------------------------------------------------------------------------------#
-        with tab7:
-            st.warning(" Comparison between Numeric Var GroupBy Categorical Var  ", icon = "🕹️")
+        if tab7.open:
+            with tab7:
+                st.warning(" Comparison between Numeric Var GroupBy Categorical Var  ", icon = "🕹️")
             
-            # Filter numeric and categorical columns
-            numeric_columns = df.select_dtypes(include = ['number']).columns.tolist()
-            categorical_columns = df.select_dtypes(include = ['object', 'category']).columns.tolist()
-
-            if numeric_columns and categorical_columns:
-                selected_category_column = st.selectbox(
-                'Select Categorical Column',
-                categorical_columns,
-                key = 'category_selector_tab7',
-                )
-
-                if selected_category_column:
-                    st.write(f"Selected Category: {selected_category_column}")
+                # Numeric and categorical columns come from the dataset profile
+                if numeric_columns and categorical_columns:
+                    selected_category_column = st.selectbox(
+                    'Select Categorical Column',
+                    categorical_columns,
+                    key = 'category_selector_tab7',
+                    )
 
-                    # Check if selected columns exist in df
-                    if selected_category_column not in df.columns:
-                        st.error(f"Column {selected_category_column} not found in dataframe.")
-                    else:
-                        # Generate pairplot
-                        pairplot_fig = sns.pairplot(
-                        df,
-                        hue = selected_category_column,
-                        vars = numeric_columns,
-                        corner = True,
-                        plot_kws = {'alpha': 0.7},
-                        )
-                        
-                        # Display the plot using Streamlit
-                        st.pyplot(pairplot_fig)
-            else:
-                st.write("Ensure your dataset contains both numeric and categorical columns.", icon = "❗")
+                    if selected_category_column:
+                        st.write(f"Selected Category: {selected_category_column}")
+
+                        # Check if selected columns exist in df
+                        if selected_category_column not in df.columns:
+                            st.error(f"Column {selected_category_column} not found in dataframe.")
+                        else:
+                            # Pairplot draws every point: sample rows stratified by the hue column when the frame is large
+                            if is_sampled(len(df)):
+                                st.caption(sample_note(len(df)))
+
+                            # Display the plot using Streamlit, once asked for: this is the slowest plot of the app, drawn in a worker process
+                            if run_requested('pairplot', (dataset_fingerprint, selected_category_column), '▶️ Draw Pair Plot'):
+                                show_figure_job('pairplot', (selected_category_column,), pair_grid,
+                                                lambda: (stratified_sample(df[[selected_category_column] + numeric_columns], by = selected_category_column),
+                                                         selected_category_column, numeric_columns))
+                else:
+                    st.write("Ensure your dataset contains both numeric and categorical columns.", icon = "❗")
     #------------------------------------------------------------------------------------------------------#
     if selected == "Dashboard":
-        st.error(" This Tab can only be used by the Developer ", icon = "⛔")
-        st.warning(" Remember to [Clear Cache] ", icon = "✂️")
         st.info(" Switch [Settings] ➡️ [Appearance] ➡️ [Wide Mode] ", icon = "ℹ️")
-        @st.cache_resource
-        def get_pyg_renderer() -> 'StreamlitRenderer':
-            return StreamlitRenderer(
-            df, 
-            spec='./gw_config.json', 
-            spec_io_mode = 'rw',
-            )
-
-        renderer = get_pyg_renderer()
+        # PyGWalker is only imported once the Dashboard is opened
+        from pygwalker.api.streamlit import StreamlitRenderer
+
+        # Kernel computation: PyGWalker aggregates with DuckDB on the server instead of shipping every row to the browser
+        # (on by default, as PyGWalker itself does)
+        kernel_computation = st.toggle('Kernel computation (DuckDB, for large datasets)', value = True,
+                                       key = f'pyg_kernel_computation_{dataset_fingerprint}')
+
+        # One renderer per dataset & kernel setting, shared by every session and attached to the dataset's cache entry
+        # (evicted with the frame); both settings save their charts to the dataset's spec file
+        def get_pyg_renderer(dataset_fingerprint, kernel_computation, _df) -> 'StreamlitRenderer':
+            def open_renderer():
+                spec_id = fingerprint_bytes(dataset_fingerprint.encode())[:16]
+                os.makedirs(PYG_SPEC_DIR, exist_ok = True)
+                return StreamlitRenderer(
+                _df, 
+                gid = f"{spec_id}-{'kernel' if kernel_computation else 'browser'}",
+                spec = os.path.join(PYG_SPEC_DIR, f'{spec_id}.json'), 
+                spec_io_mode = 'rw',
+                kernel_computation = kernel_computation,
+                )
+            return get_dataset_cache().attachment(dataset_fingerprint, ('pyg_renderer', kernel_computation), open_renderer)
+
+        with perf.stage('dashboard: renderer'):
+            renderer = get_pyg_renderer(dataset_fingerprint, kernel_computation, df)
         renderer.explorer()
     #------------------------------------------------------------------------------------------------------#
 else:
     st.error('Click TOP-LEFT Side Bar Navigation to GET STARTED', icon = "📎")
+#------------------------------------------------------------------------------------------------------#
+
+if selected == "Performance":
+    perf_log = get_perf_log()
+    st.warning(" Where the Reruns of the App Spend their Time ", icon = "⏱️")
+
+    st.info('Stages of your previous rerun', icon = "1️⃣")
+    last_rerun = st.session_state.get('last_rerun')
+    if last_rerun is not None:
+        st.write(f"Total: {last_rerun.seconds:.3f} s")
+        st.dataframe(pd.DataFrame([vars(stage) for stage in last_rerun.stages]), width = 'stretch')
+
+    st.info('All stages since the app started (every session)', icon = "2️⃣")
+    st.dataframe(pd.DataFrame(perf_log.stage_summary()), width = 'stretch')
+
+    st.info(f'Slow reruns (≥ {SLOW_RERUN_SECONDS:g} s)', icon = "3️⃣")
+    slow_reruns = [{'started': pd.Timestamp(rerun.started, unit = 's'),
+                    'seconds': rerun.seconds,
+                    'slowest stage': max(rerun.stages, key = lambda stage: stage.seconds).name if rerun.stages else None,
+                    **{key: rerun.context.get(key) for key in ('dataset', 'shape', 'menu')},
+                    'widgets': str(rerun.context.get('widgets'))}
+                   for rerun in reversed(perf_log.slow)]
+    st.dataframe(pd.DataFrame(slow_reruns), width = 'stretch')
+
+    col1, col2 = st.columns(2)
+    col1.download_button('⬇️ Export JSON', perf_log.to_json(), file_name = 'eda_perf.json', mime = 'application/json')
+    col2.download_button('⬇️ Export Prometheus text', perf_log.to_prometheus(), file_name = 'eda_perf.prom', mime = 'text/plain')
+
+# Record this rerun: dataset shape and widget state go along, so slow reruns can be reproduced
+widget_state = {key: value for key, value in st.session_state.items()
+                if isinstance(value, (str, int, float, bool, tuple, list)) and key != 'session_key'}
+rerun = perf.finish({
+    'dataset': dataset_fingerprint,
+    'shape': None if df is None else df.shape,
+    'menu': selected,
+    'widgets': widget_state,
+})
+st.session_state['last_rerun'] = rerun
+get_perf_log().record(rerun)
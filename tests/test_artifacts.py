@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from toolkit.artifacts import ArtifactGraph
+
+
+def test_changing_one_selection_recomputes_only_downstream_nodes():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'day': rng.choice(['Thu', 'Fri', 'Sat'], 300),
+        'sex': rng.choice(['F', 'M'], 300),
+        'tip': rng.uniform(1, 10, 300),
+        'bill': rng.uniform(5, 50, 300),
+    })
+    graph = ArtifactGraph(df)
+    graph.anova('day', 'tip')
+    graph.groups('day', 'tip')
+    assert graph.computed == {'category_codes': 1, 'numeric_values': 1, 'group_stats': 1, 'anova': 1, 'groups': 1}
+
+    # Same selections: everything is memoized
+    graph.anova('day', 'tip')
+    graph.groups('day', 'tip')
+    assert sum(graph.computed.values()) == 5
+
+    # Another numeric column reuses the category codes
+    graph.anova('day', 'bill')
+    assert graph.computed == {'category_codes': 1, 'numeric_values': 2, 'group_stats': 2, 'anova': 2, 'groups': 1}
+
+    # Another category reuses the numeric vector
+    graph.groups('sex', 'bill')
+    assert graph.computed == {'category_codes': 2, 'numeric_values': 2, 'group_stats': 2, 'anova': 2, 'groups': 2}
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from toolkit.analysis import anova_report, filter_rows, value_count_table
+from toolkit.backends import csv_kinds, open_backend, spill_upload
+from toolkit.columnar import read_columnar
+from toolkit.filtering import Condition
+from toolkit.ingest import read_csv_chunked
+from toolkit.loading import DatasetCache
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    # Columns an engine's CSV sniffer types differently from pandas: Yes/No (BOOLEAN) and ISO dates (DATE)
+    rng = np.random.default_rng(0)
+    n = 200
+    frame = pd.DataFrame({
+        'smoker': rng.choice(['Yes', 'No'], n),
+        'day': rng.choice(['2024-01-01', '2024-01-02', '2024-01-03'], n),
+        'size': rng.integers(1, 6, n),
+        'tip': rng.uniform(1, 10, n).round(2),
+    })
+    path = tmp_path / 'tips.csv'
+    frame.to_csv(path, index = False)
+    return str(path)
+
+
+@pytest.mark.parametrize('engine', ['duckdb', 'polars'])
+def test_csv_backend_matches_pandas(csv_path, engine):
+    pytest.importorskip(engine)
+    df = read_csv_chunked(csv_path)
+    backend = open_backend(engine, csv_path, 'csv', csv_kinds(df))
+
+    # Labels as the UI shows them: str() of the values pandas loaded ('day' was parsed as datetimes)
+    day = str(df['day'].iloc[0])
+    for conditions in ([Condition('smoker', values = ['No'])],
+                       [Condition('day', values = [day]), Condition('size', values = ['3', '4'])],
+                       [Condition('smoker', values = ['Yes']), Condition('tip', bounds = (2.0, 5.0))]):
+        assert filter_rows(df, conditions, backend = backend).n_rows == filter_rows(df, conditions).n_rows
+
+    for column in ('smoker', 'day'):
+        expected = value_count_table(df, column)['counts']
+        counts = value_count_table(df, column, backend = backend)['counts']
+        assert counts.to_dict() == expected.to_dict()
+
+    expected = anova_report(df, 'smoker', 'tip')
+    report = anova_report(df, 'smoker', 'tip', backend = backend)
+    assert list(report.stats.labels) == list(expected.stats.labels)
+    np.testing.assert_allclose(report.stats.mean, expected.stats.mean)
+    assert report.result.statistic == pytest.approx(expected.result.statistic)
+
+
+def _write_ipc(frame: pd.DataFrame, path: str, stream: bool):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index = False)
+    with pa.OSFile(path, 'wb') as sink:
+        with (pa.ipc.new_stream if stream else pa.ipc.new_file)(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+@pytest.mark.parametrize('engine', ['duckdb', 'polars'])
+@pytest.mark.parametrize('file_name, file_format', [('tips.feather', 'feather'), ('tips.arrow', 'arrow'), ('tips.arrows', 'arrow')])
+def test_ipc_backend_matches_pandas(tmp_path, engine, file_name, file_format):
+    pytest.importorskip(engine)
+    frame = pd.DataFrame({'smoker': ['Yes', 'Yes', 'No'] * 20, 'tip': np.arange(60) % 7 + 0.5})
+    path = str(tmp_path / file_name)
+    _write_ipc(frame, path, stream = file_name.endswith('.arrows'))
+    df = read_columnar(path, file_format)
+    backend = open_backend(engine, path, file_format)
+
+    conditions = [Condition('smoker', values = ['No']), Condition('tip', bounds = (1.0, 5.0))]
+    assert filter_rows(df, conditions, backend = backend).n_rows == filter_rows(df, conditions).n_rows
+    assert value_count_table(df, 'smoker', backend = backend)['counts'].to_dict() == value_count_table(df, 'smoker')['counts'].to_dict()
+    assert anova_report(df, 'smoker', 'tip', backend = backend).result.statistic == pytest.approx(anova_report(df, 'smoker', 'tip').result.statistic)
+
+
+@pytest.mark.parametrize('engine', ['duckdb', 'polars'])
+def test_timestamp_filters_match_pandas(tmp_path, engine):
+    # Every timestamp unit & time zone is filtered on as datetimes, not through its engine-specific string form
+    pytest.importorskip(engine)
+    stamps = pd.date_range('2024-01-01 08:00', periods = 6, freq = 'h')
+    frame = pd.DataFrame({
+        'ns': stamps.astype('datetime64[ns]'),
+        'ms': stamps.astype('datetime64[ms]'),
+        's': stamps.astype('datetime64[s]'),
+        'utc': stamps.tz_localize('UTC'),
+        'paris': stamps.tz_localize('Europe/Paris'),
+    })
+    path = str(tmp_path / 'stamps.parquet')
+    frame.to_parquet(path)
+    df = read_columnar(path, 'parquet')
+    backend = open_backend(engine, path, 'parquet')
+
+    for column in frame.columns:
+        conditions = [Condition(column, values = [str(df[column].iloc[2]), str(df[column].iloc[4])])]
+        assert filter_rows(df, conditions, backend = backend).n_rows == filter_rows(df, conditions).n_rows == 2
+
+
+def test_spilled_upload_is_deleted_with_its_dataset(tmp_path):
+    cache = DatasetCache(max_entries = 1)
+    cache.put('csv:upload', pd.DataFrame({'value': [1.0]}))
+    spilled = cache.attachment('csv:upload', 'spilled_upload', lambda: spill_upload(b'value\n1.0\n', 'upload', 'csv', str(tmp_path)))
+    assert os.path.exists(spilled.path)
+
+    cache.put('csv:other', pd.DataFrame({'value': [2.0]}))
+    assert not os.path.exists(spilled.path)
@@ -0,0 +1,13 @@
+import pandas as pd
+
+from toolkit.analysis import filter_rows
+from toolkit.filtering import Condition
+
+
+def test_filters_with_the_same_description_have_different_keys():
+    df = pd.DataFrame({'label': ['a, b', 'a', 'b', 'c']})
+    joined = filter_rows(df, [Condition('label', values = ['a, b'])])
+    separate = filter_rows(df, [Condition('label', values = ['a', 'b'])])
+    assert joined.description == separate.description
+    assert joined.key != separate.key
+    assert (joined.n_rows, separate.n_rows) == (1, 2)
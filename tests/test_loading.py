@@ -0,0 +1,39 @@
+import gc
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from toolkit.artifacts import ArtifactGraph
+from toolkit.loading import DatasetCache
+
+
+def test_attachments_are_evicted_with_their_frame():
+    cache = DatasetCache(max_entries = 1)
+    df = pd.DataFrame({'category': np.repeat(['a', 'b'], 500), 'value': np.arange(1000.0)})
+    frame = weakref.ref(df)
+    cache.put('first', df)
+    graph = cache.attachment('first', 'artifacts', lambda: ArtifactGraph(df))
+    graph.anova('category', 'value')
+    assert cache.attachment('first', 'artifacts', lambda: None) is graph
+    assert cache.nbytes > cache._nbytes
+
+    del df, graph
+    cache.put('second', pd.DataFrame({'value': [1.0]}))
+    gc.collect()
+    assert frame() is None
+    assert cache.nbytes == cache._nbytes
+
+
+def test_attachments_count_towards_the_budget():
+    cache = DatasetCache(max_entries = 8, max_bytes = 10_000)
+    cache.put('first', pd.DataFrame({'value': [1.0]}))
+    cache.attachment('first', 'index', lambda: np.zeros(2_000))  # 16 kB
+    cache.put('second', pd.DataFrame({'value': [1.0]}))
+    assert 'first' not in cache
+
+
+def test_attachment_of_a_missing_entry_is_not_kept():
+    cache = DatasetCache()
+    built = cache.attachment('missing', 'artifacts', lambda: object())
+    assert cache.attachment('missing', 'artifacts', lambda: object()) is not built
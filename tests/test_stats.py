@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from toolkit.analysis import anova_report
+from toolkit.artifacts import ArtifactGraph
+from toolkit.correlation import correlation_matrix, variance_inflation_factors
+from toolkit.plotting import split_by_group
+from toolkit.stats import group_statistics, one_way_anova
+from toolkit.summary import SUMMARY_PERCENTILES, KllSketch, frame_chunks, summarize_chunks
+
+
+@pytest.fixture
+def df():
+    # Category 'c' has rows, but none with a numeric value
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'category': ['a'] * 20 + ['b'] * 20 + ['c'] * 5,
+        'value': np.concatenate([rng.normal(0, 1, 20), rng.normal(1, 1, 20), np.full(5, np.nan)]),
+    })
+
+
+def test_all_missing_category_forms_no_group(df):
+    stats = group_statistics(df['category'], df['value'])
+    assert list(stats.labels) == ['a', 'b']
+    assert list(stats.count) == [20, 20]
+    assert [label for label, _ in split_by_group(df['category'], df['value'])] == ['a', 'b']
+
+
+def test_anova_ignores_all_missing_category(df):
+    expected = anova_report(df.dropna(), 'category', 'value')
+    for report in (anova_report(df, 'category', 'value'), ArtifactGraph(df).anova('category', 'value')):
+        assert report.problem is None
+        assert report.result.statistic == pytest.approx(expected.result.statistic)
+    assert [label for label, _ in ArtifactGraph(df).groups('category', 'value')] == ['a', 'b']
+#------------------------------------------------------------------------------------------------------#
+
+def test_group_statistics_match_groupby_and_scipy():
+    from scipy.stats import f_oneway
+
+    rng = np.random.default_rng(1)
+    categories = pd.Series(rng.choice(['x', 'y', 'z', None], 2_000), name = 'category')
+    values = pd.Series(rng.normal(100, 5, 2_000), name = 'value').mask(rng.random(2_000) < 0.05)
+    frame = pd.DataFrame({'category': categories, 'value': values}).dropna()
+    grouped = frame.groupby('category')['value']
+
+    stats = group_statistics(categories, values)
+    assert list(stats.labels) == list(grouped.count().index)
+    np.testing.assert_array_equal(stats.count, grouped.count())
+    np.testing.assert_allclose(stats.mean, grouped.mean(), rtol = 1e-12)
+    np.testing.assert_allclose(stats.m2 / (stats.count - 1), grouped.var(), rtol = 1e-9)
+    np.testing.assert_array_equal(stats.minimum, grouped.min())
+    np.testing.assert_array_equal(stats.maximum, grouped.max())
+    for q, quantile in stats.quantiles.items():
+        np.testing.assert_allclose(quantile, grouped.quantile(q), rtol = 1e-12)
+
+    expected = f_oneway(*[group.to_numpy() for _, group in grouped])
+    result = one_way_anova(stats)
+    assert result.statistic == pytest.approx(expected.statistic, rel = 1e-9)
+    assert result.pvalue == pytest.approx(expected.pvalue, rel = 1e-6)
+
+
+def test_vif_matches_statsmodels():
+    sm = pytest.importorskip('statsmodels.api')
+    from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+    rng = np.random.default_rng(2)
+    base = rng.normal(size = (1_000, 3))
+    frame = pd.DataFrame({'a': base[:, 0] + 50, 'b': base[:, 1], 'c': base[:, 0] + 0.5 * base[:, 2], 'd': base.sum(axis = 1) + rng.normal(size = 1_000)})
+    exog = sm.add_constant(frame).to_numpy()
+    vif = variance_inflation_factors(frame)['VIF'].to_numpy()
+    np.testing.assert_allclose(vif[1:], [variance_inflation_factor(exog, i) for i in range(1, exog.shape[1])], rtol = 1e-6)
+
+    # Intercept: the auxiliary regression of the constant on the raw columns (recent statsmodels standardize it away)
+    r_squared = sm.OLS(exog[:, 0], exog[:, 1:]).fit().rsquared
+    assert vif[0] == pytest.approx(1 / (1 - r_squared), rel = 1e-6)
+
+
+def test_vif_without_complete_rows_is_nan():
+    frame = pd.DataFrame({'a': [1.0, np.nan, 3.0], 'b': [np.nan, 2.0, np.nan]})
+    vif = variance_inflation_factors(frame)
+    assert list(vif['feature']) == ['const', 'a', 'b']
+    assert vif['VIF'].isna().all()
+
+
+def test_masked_pearson_and_kendall_match_pandas():
+    rng = np.random.default_rng(3)
+    base = rng.normal(size = (500, 4))
+    frame = pd.DataFrame(base @ rng.normal(size = (4, 4)), columns = list('abcd'))
+    frame = frame.mask(rng.random(frame.shape) < 0.1)
+    for method in ('pearson', 'kendall'):
+        np.testing.assert_allclose(correlation_matrix(frame, method = method), frame.corr(method = method), atol = 1e-10)
+
+
+def test_kll_quantiles_are_within_the_rank_error_bound():
+    # Compacted sketches, fed & merged chunk by chunk: the rank of each returned quantile is within ~1.65 / k
+    k = 128
+    values = np.random.default_rng(4).standard_normal(200_000)
+    left, right = KllSketch(k, seed = 0), KllSketch(k, seed = 1)
+    for i, chunk in enumerate(np.array_split(values, 40)):
+        (left if i % 2 else right).update(chunk)
+    sketch = left.merge(right)
+    assert not sketch.is_exact and sketch.n == len(values)
+
+    qs = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+    ranks = np.searchsorted(np.sort(values), sketch.quantiles(qs), side = 'right') / len(values)
+    assert np.abs(ranks - qs).max() <= 2.5 / k
+
+
+def test_small_streams_have_exact_quantiles():
+    frame = pd.DataFrame({'a': np.random.default_rng(5).normal(size = 300), 'b': np.arange(300.0)})
+    summary = summarize_chunks(frame_chunks(frame, chunk_rows = 64))
+    assert not summary.attrs['approximate']
+    pd.testing.assert_frame_equal(summary, frame.describe(list(SUMMARY_PERCENTILES)), rtol = 1e-12)
@@ -0,0 +1,18 @@
+# Helpers behind the Streamlit page in main.py
+from toolkit.loading import DatasetCache, fingerprint_bytes, load_seaborn_dataset
+from toolkit.ingest import infer_csv_plan, iter_csv_chunks, read_csv_chunked
+from toolkit.columnar import detect_format, read_columnar, read_schema
+from toolkit.profiling import ColumnProfile, DatasetProfile, build_profile
+from toolkit.filtering import ColumnIndex, Condition, filter_positions
+from toolkit.stats import AnovaResult, GroupStats, group_statistics, one_way_anova
+from toolkit.plotting import binned_kde, binned_kde_2d, fold_categories, is_large, partition_xy, stratified_sample
+from toolkit.figures import cached_render, render_figure, render_job
+from toolkit.correlation import sample_frame, scatter_matrix, variance_inflation_factors, vif_from_moments, vif_moments
+from toolkit.correlation import cluster_order, correlation_matrix, strongest_pairs
+from toolkit.summary import KllSketch, RunningMoments, summarize_chunks
+from toolkit.grid import arrow_page, sort_positions
+from toolkit.jobs import Job, JobCancelled, JobRunner
+from toolkit.perf import PerfLog, PerfRecorder
+from toolkit.analysis import AnovaReport, CorrelationReport, DatasetReport, anova_report, correlation_report, dataset_report, filter_rows
+from toolkit.backends import DuckDBBackend, PolarsBackend, QueryBackend, available_engines, csv_kinds, open_backend
+from toolkit.artifacts import ArtifactGraph
@@ -0,0 +1,185 @@
+'''
+Headless analysis API: the computations behind every tab of main.py as pure functions
+with typed inputs and outputs. Nothing here imports Streamlit, so reports can be precomputed
+in batch jobs and each function memoized on its own.
+'''
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from toolkit.backends import QueryBackend
+from toolkit.correlation import cluster_order, correlation_matrix, strongest_pairs, variance_inflation_factors
+from toolkit.filtering import ColumnIndex, filter_positions
+from toolkit.plotting import fold_categories
+from toolkit.profiling import DatasetProfile, build_profile
+from toolkit.stats import AnovaResult, GroupStats, group_statistics, one_way_anova
+from toolkit.summary import frame_chunks, summarize_chunks
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class FilterResult:
+    conditions: list
+    positions: np.ndarray | None   # row positions of the matching rows, ascending (None when a query backend counted them)
+    count: int | None = None
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.positions) if self.positions is not None else self.count
+
+    @property
+    def description(self) -> str:
+        return ', '.join(condition.describe() for condition in self.conditions) or 'all rows'
+
+    @property
+    def key(self) -> tuple:
+        # The conditions in hashable form, e.g. for cache keys: two filters can share a description ('a, b' vs 'a', 'b')
+        return tuple((condition.column, None if condition.values is None else tuple(condition.values), condition.bounds)
+                     for condition in self.conditions)
+
+
+def filter_rows(df: pd.DataFrame, conditions: list, get_index = None, backend: QueryBackend | None = None) -> FilterResult:
+    # `get_index(column)` may return cached ColumnIndex objects; by default indexes are built for this call only.
+    # A query backend only counts the matching rows: pages are then queried from it as well
+    if backend is not None:
+        return FilterResult(list(conditions), None, backend.count(conditions))
+    if get_index is None:
+        indexes = {}
+        get_index = lambda column: indexes.setdefault(column, ColumnIndex(df[column]))
+    return FilterResult(list(conditions), filter_positions(get_index, conditions, len(df)))
+
+
+def value_count_table(df: pd.DataFrame, column: str, profile: DatasetProfile | None = None,
+                      backend: QueryBackend | None = None) -> pd.DataFrame:
+    # Value counts of a column (from the backend, or from the profile when it kept them), as a one-column 'counts' frame
+    if backend is not None:
+        value_counts = backend.value_counts(column)
+    else:
+        value_counts = profile[column].value_counts if profile is not None else None
+    if value_counts is None:
+        value_counts = df[column].value_counts()
+    table = value_counts.rename('counts').to_frame()
+    table.index.name = column
+    return table
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class AnovaReport:
+    category: str
+    numeric: str
+    stats: GroupStats
+    result: AnovaResult | None = None
+    problem: str | None = None     # why the test cannot run (too few groups, tiny or constant groups)
+
+    @property
+    def significant(self) -> bool:
+        return self.result is not None and self.result.pvalue < 0.05
+
+    def table(self) -> pd.DataFrame:
+        # Count / Mean / STD / Q1-Q3 per group (rows) as shown in the ANOVA tab, rounded to 3 decimals
+        table = self.stats.to_frame()
+        table[['mean', 'std', 'q1', 'median', 'q3']] = table[['mean', 'std', 'q1', 'median', 'q3']].round(3)
+        return table.rename(columns = {'count': 'Count', 'mean': 'Mean', 'std': 'STD', 'q1': 'Q1', 'median': 'Q2', 'q3': 'Q3'})
+
+
+def anova_report(df: pd.DataFrame, category: str, numeric: str, backend: QueryBackend | None = None) -> AnovaReport:
+    '''
+    Group statistics of `numeric` by `category` and the one-way ANOVA between the groups;
+    rows missing either value are ignored. With a query backend the statistics are aggregated
+    by the engine over the dataset file instead of `df`.
+    '''
+    if backend is not None:
+        stats = backend.group_statistics(category, numeric)
+    else:
+        stats = group_statistics(df[category], df[numeric])
+    return anova_from_stats(category, numeric, stats)
+
+
+def anova_from_stats(category: str, numeric: str, stats: GroupStats) -> AnovaReport:
+    # Checks the groups can be compared, then runs the F-test on their sufficient statistics
+    report = AnovaReport(category, numeric, stats)
+    if len(stats.labels) < 2:
+        report.problem = f"{category} needs at least two groups for ANOVA analysis!"
+        return report
+    for label, count, minimum, maximum in zip(stats.labels, stats.count, stats.minimum, stats.maximum):
+        if count < 2:
+            report.problem = f"Group '{label}' does not have enough data for ANOVA analysis!"
+            return report
+        if minimum == maximum:
+            report.problem = f"Group '{label}' has constant values, making ANOVA analysis impossible!"
+            return report
+    report.result = one_way_anova(stats)
+    return report
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class CorrelationReport:
+    matrix: pd.DataFrame           # in display order (clustered when asked for)
+    pairs: pd.DataFrame            # strongest pairs, |r| descending
+    mask: np.ndarray               # cells hidden from the heatmap: upper triangle and, with top_k, the other pairs
+
+
+def correlation_report(df: pd.DataFrame,
+                       columns: list,
+                       method: str = 'pearson',
+                       sample_rows: int | None = None,
+                       cluster: bool = False,
+                       top_k: int = 0) -> CorrelationReport:
+    matrix = correlation_matrix(df[columns], method = method, sample_rows = sample_rows)
+    if cluster:
+        order = cluster_order(matrix)
+        matrix = matrix.loc[order, order]
+    pairs = strongest_pairs(matrix, k = top_k or 10)
+
+    mask = np.triu(np.ones(matrix.shape, dtype = bool))
+    if top_k:
+        keep = np.zeros(matrix.shape, dtype = bool)
+        position = {column: i for i, column in enumerate(matrix.columns)}
+        for first, second in zip(pairs['Variable 1'], pairs['Variable 2']):
+            keep[position[first], position[second]] = keep[position[second], position[first]] = True
+        mask |= ~keep
+    return CorrelationReport(matrix, pairs, mask)
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class DensityPlan:
+    shown: list                    # categories with a panel of their own, most frequent first
+    folded: list                   # categories pooled into the last panel
+
+
+def density_plan(df: pd.DataFrame, category: str, profile: DatasetProfile | None = None) -> DensityPlan:
+    value_counts = profile[category].value_counts if profile is not None else None
+    if value_counts is None:
+        value_counts = df[category].value_counts()
+    shown, folded = fold_categories(value_counts.index.tolist())
+    return DensityPlan(shown, folded)
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class DatasetReport:
+    profile: DatasetProfile
+    summary: pd.DataFrame | None = None
+    vif: pd.DataFrame | None = None
+    correlation: CorrelationReport | None = None
+    anova: dict = field(default_factory = dict)   # (category, numeric) -> AnovaReport
+
+
+def dataset_report(df: pd.DataFrame, anova_pairs: list | None = None, vif_sample_rows: int | None = None) -> DatasetReport:
+    '''
+    Every tab's tables for one frame, e.g. for a batch job: profile, numeric summary, VIF, correlation,
+    and an ANOVA per (categorical, numeric) pair (all pairs unless `anova_pairs` is given).
+    '''
+    profile = build_profile(df)
+    report = DatasetReport(profile)
+    numeric_columns = profile.numeric_columns
+    if numeric_columns:
+        report.summary = summarize_chunks(frame_chunks(df[numeric_columns]))
+        report.vif = variance_inflation_factors(df[numeric_columns], sample_rows = vif_sample_rows)
+        report.correlation = correlation_report(df, numeric_columns)
+    if anova_pairs is None:
+        anova_pairs = [(category, numeric) for category in profile.categorical_columns for numeric in numeric_columns]
+    for category, numeric in anova_pairs:
+        report.anova[(category, numeric)] = anova_report(df, category, numeric)
+    return report
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+import pandas as pd
+
+from toolkit.analysis import AnovaReport, anova_from_stats
+from toolkit.loading import DatasetCache
+from toolkit.plotting import split_codes
+from toolkit.stats import GroupStats, factorize_categories, group_statistics_from_codes, numeric_vector
+#------------------------------------------------------------------------------------------------------#
+
+class ArtifactGraph:
+    '''
+    Intermediate results of the Plot tabs for one (immutable) frame, memoized by node and exact inputs:
+
+        category_codes(category) ─┐
+                                  ├─> group_stats(category, numeric) ──> anova(category, numeric)
+        numeric_values(numeric) ──┤
+                                  └─> groups(category, numeric)
+
+    A node asks the graph for the nodes it depends on, so changing one selection only recomputes the nodes
+    downstream of it: picking another numeric column reuses the category codes, and vice versa.
+    '''
+
+    def __init__(self, df: pd.DataFrame, max_entries: int = 256, max_bytes: int = 512 * 1024 ** 2):
+        self.df = df
+        self.computed = Counter()   # node -> number of times it was (re)computed
+        self._artifacts = DatasetCache(max_entries = max_entries, max_bytes = max_bytes)
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        # Memory held by the memoized intermediates (the frame itself belongs to the caller)
+        return self._artifacts.nbytes
+
+    def _artifact(self, node: str, inputs: tuple, compute, nbytes = None):
+        key = (node,) + inputs
+        value = self._artifacts.get(key)
+        if value is None:
+            value = compute()
+            self._artifacts.put(key, value, nbytes = nbytes(value) if nbytes is not None else None)
+            with self._lock:
+                self.computed[node] += 1
+        return value
+
+    def category_codes(self, category: str) -> tuple:
+        # (codes, labels) of the column, code -1 for missing values
+        return self._artifact('category_codes', (category,), lambda: factorize_categories(self.df[category]),
+                              nbytes = lambda codes_labels: codes_labels[0].nbytes)
+
+    def numeric_values(self, numeric: str):
+        # float64 vector of the column, NaN for missing or non-numeric values
+        return self._artifact('numeric_values', (numeric,), lambda: numeric_vector(self.df[numeric]))
+
+    def group_stats(self, category: str, numeric: str) -> GroupStats:
+        def compute():
+            codes, labels = self.category_codes(category)
+            return group_statistics_from_codes(codes, pd.Index(labels, name = category), self.numeric_values(numeric))
+        return self._artifact('group_stats', (category, numeric), compute)
+
+    def anova(self, category: str, numeric: str) -> AnovaReport:
+        return self._artifact('anova', (category, numeric), lambda: anova_from_stats(category, numeric, self.group_stats(category, numeric)))
+
+    def groups(self, category: str, numeric: str) -> list:
+        # [(label, values)] of the rows having both values, as split_by_group
+        def compute():
+            codes, labels = self.category_codes(category)
+            return split_codes(codes, labels, self.numeric_values(numeric))
+        return self._artifact('groups', (category, numeric), compute,
+                              nbytes = lambda groups: sum(values.nbytes for _, values in groups))
@@ -0,0 +1,347 @@
+'''
+Query backends: the filter, value-count and grouped-statistics queries of the Summary & ANOVA tabs,
+run as lazy scans of the dataset file by DuckDB or Polars instead of pandas operations on the loaded frame.
+Both push the predicates and the projection down into the scan and run multithreaded, so they also
+cover the rows a memory-budgeted CSV load left out. pandas (no backend) stays the default and the fallback.
+'''
+from __future__ import annotations
+
+import abc
+import importlib.util
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from toolkit.columnar import is_ipc_file_format, open_ipc_reader
+from toolkit.stats import GroupStats
+#------------------------------------------------------------------------------------------------------#
+
+QUERY_ENGINES = ('pandas', 'duckdb', 'polars')
+DEFAULT_QUERY_ENGINE = os.environ.get('EDA_QUERY_ENGINE', 'pandas')
+
+# Uploads are written here (one file per cached dataset) so the engines can scan them as files
+SPILL_DIR = os.environ.get('EDA_SPILL_DIR', os.path.join('.cache', 'uploads'))
+
+GROUP_QUANTILES = (0.25, 0.5, 0.75)
+#------------------------------------------------------------------------------------------------------#
+
+def available_engines() -> list:
+    # pandas always; DuckDB / Polars when installed (checked without importing them)
+    return [engine for engine in QUERY_ENGINES if engine == 'pandas' or importlib.util.find_spec(engine) is not None]
+
+
+class SpilledUpload:
+    # An upload written to `spill_dir`; `close()` deletes the file, e.g. when its dataset is evicted from the cache
+    def __init__(self, path: str):
+        self.path = path
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def spill_upload(data: bytes, name: str, file_format: str, spill_dir: str = SPILL_DIR) -> SpilledUpload:
+    os.makedirs(spill_dir, exist_ok = True)
+    path = os.path.join(spill_dir, f"{name}.{file_format}")
+    if not os.path.exists(path):
+        partial = f"{path}.{threading.get_ident()}.part"
+        with open(partial, 'wb') as f:
+            f.write(data)
+        os.replace(partial, path)
+    return SpilledUpload(path)
+
+
+def clear_spills(spill_dir: str = SPILL_DIR):
+    # Spilled files of a previous run of the app: no cache entry owns them anymore
+    if not os.path.isdir(spill_dir):
+        return
+    for name in os.listdir(spill_dir):
+        SpilledUpload(os.path.join(spill_dir, name)).close()
+
+
+def csv_kinds(df: pd.DataFrame) -> dict:
+    '''
+    {column: 'str' | 'datetime'} for the columns of a loaded CSV that pandas holds as strings (object, string,
+    or categories of strings) or parsed as datetimes. An engine scanning the same file has to read them the same way:
+    its own type sniffing would e.g. turn Yes/No into booleans, and the UI labels would stop matching.
+    '''
+    kinds = {}
+    for column, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            kinds[column] = 'datetime'
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            kinds[column] = 'str'
+    return kinds
+
+
+def _typed_labels(labels: list, kind: str) -> list:
+    # The UI filters on values as strings: turn them back into the column's type so the comparison can be pushed down
+    values = []
+    for label in labels:
+        try:
+            if kind == 'bool':
+                values.append({'True': True, 'False': False}[str(label)])
+            elif kind == 'int':
+                number = float(label)
+                if number.is_integer():
+                    values.append(int(number))
+            elif kind == 'float':
+                values.append(float(label))
+            elif kind == 'datetime':
+                values.append(pd.Timestamp(label).to_pydatetime())
+            else:
+                values.append(str(label))
+        except (KeyError, ValueError):
+            continue  # cannot occur in this column
+    return values
+
+
+def _group_stats(frame: pd.DataFrame) -> GroupStats:
+    # One row per group (label, count, mean, m2, minimum, maximum, q0.25, ...) -> GroupStats in label order, as pandas
+    frame = frame.sort_values('label', kind = 'stable')
+    return GroupStats(
+        labels = pd.Index(frame['label']),
+        count = frame['count'].to_numpy(dtype = np.int64),
+        mean = frame['mean'].to_numpy(dtype = float),
+        m2 = frame['m2'].to_numpy(dtype = float),
+        minimum = frame['minimum'].to_numpy(dtype = float),
+        maximum = frame['maximum'].to_numpy(dtype = float),
+        quantiles = {q: frame[f'q{q}'].to_numpy(dtype = float) for q in GROUP_QUANTILES},
+    )
+#------------------------------------------------------------------------------------------------------#
+
+class QueryBackend(abc.ABC):
+    '''
+    Lazy queries over one dataset, either a file (path) or an in-memory frame.
+    `conditions` are toolkit.filtering.Condition objects, combined with AND.
+    '''
+    engine = None
+
+    @abc.abstractmethod
+    def count(self, conditions: list) -> int:
+        ...
+
+    @abc.abstractmethod
+    def page(self, conditions: list, columns: list, sort_column: str | None, descending: bool, offset: int, limit: int):
+        # Arrow table of one page of the matching rows
+        ...
+
+    @abc.abstractmethod
+    def value_counts(self, column: str) -> pd.Series:
+        ...
+
+    @abc.abstractmethod
+    def group_statistics(self, category: str, numeric: str) -> GroupStats:
+        ...
+
+
+def open_backend(engine: str, source, file_format: str | None = None, csv_kinds: dict | None = None) -> QueryBackend | None:
+    # `source` is a file path (scanned lazily) or a DataFrame; the 'pandas' engine has no backend.
+    # `csv_kinds` are the column types a CSV file is read with, as pandas loaded it (see `csv_kinds()`)
+    if engine == 'duckdb':
+        return DuckDBBackend(source, file_format, csv_kinds)
+    if engine == 'polars':
+        return PolarsBackend(source, file_format, csv_kinds)
+    if engine == 'pandas':
+        return None
+    raise ValueError(f"Unknown query engine: '{engine}'")
+#------------------------------------------------------------------------------------------------------#
+
+def _quote(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+class DuckDBBackend(QueryBackend):
+    engine = 'duckdb'
+
+    def __init__(self, source, file_format: str | None = None, csv_kinds: dict | None = None):
+        import duckdb
+
+        self._connection = duckdb.connect()
+        self._lock = threading.Lock()  # one connection, shared by the sessions showing this dataset
+        if isinstance(source, pd.DataFrame):
+            self._connection.register('dataset', source)
+        elif file_format == 'parquet':
+            self._connection.execute(f"CREATE VIEW dataset AS SELECT * FROM read_parquet({_literal(source)})")
+        elif file_format == 'csv':
+            # Every overridden column is read as text; datetimes are then parsed leniently (NULL when invalid), as pandas does
+            csv_kinds = csv_kinds or {}
+            options, replace = '', ''
+            if csv_kinds:
+                types = ', '.join(_literal(str(column)) + ": 'VARCHAR'" for column in csv_kinds)
+                options = f", types = {{{types}}}"
+            datetimes = [_quote(column) for column, kind in csv_kinds.items() if kind == 'datetime']
+            if datetimes:
+                replace = f" REPLACE ({', '.join(f'TRY_CAST({column} AS TIMESTAMP) AS {column}' for column in datetimes)})"
+            self._connection.execute(f"CREATE VIEW dataset AS SELECT *{replace} FROM read_csv({_literal(source)}{options})")
+        elif is_ipc_file_format(source):
+            # Feather / Arrow IPC file: scanned through a pyarrow dataset, which takes the pushed-down filter & projection
+            import pyarrow.dataset as ds
+            self._connection.register('dataset', ds.dataset(source, format = 'ipc'))
+        else:
+            # Arrow IPC stream (.arrows): no footer to scan from, its record batches are read once (memory-mapped)
+            self._connection.register('dataset', open_ipc_reader(source).read_all())
+        self._kinds = {name: self._kind(column_type) for name, column_type in
+                       self._connection.execute("SELECT column_name, column_type FROM (DESCRIBE dataset)").fetchall()}
+
+    @staticmethod
+    def _kind(column_type: str) -> str:
+        column_type = column_type.upper()
+        if column_type == 'BOOLEAN':
+            return 'bool'
+        if column_type.endswith('INT') or column_type in ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT'):
+            return 'int'
+        if column_type in ('FLOAT', 'DOUBLE', 'REAL') or column_type.startswith('DECIMAL'):
+            return 'float'
+        if column_type == 'VARCHAR':
+            return 'str'
+        if column_type == 'DATE' or column_type.startswith('TIMESTAMP'):  # any unit, with or without time zone
+            return 'datetime'
+        return 'other'
+
+    def _query(self, sql: str, parameters = None, fetch = lambda result: result.df()):
+        # Execute & fetch under the lock: the result belongs to the shared connection
+        with self._lock:
+            return fetch(self._connection.execute(sql, parameters or []))
+
+    def _where(self, conditions: list):
+        clauses, parameters = [], []
+        for condition in conditions:
+            column = _quote(condition.column)
+            if condition.bounds is not None:
+                clauses.append(f"{column} BETWEEN ? AND ?")
+                parameters += list(condition.bounds)
+                continue
+            kind = self._kinds.get(condition.column, 'other')
+            values = _typed_labels(condition.values, kind)
+            if not values:
+                clauses.append('FALSE')
+                continue
+            target = column if kind != 'other' else f"CAST({column} AS VARCHAR)"
+            clauses.append(f"{target} IN ({', '.join('?' * len(values))})")
+            parameters += values
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', parameters
+
+    def count(self, conditions: list) -> int:
+        where, parameters = self._where(conditions)
+        return self._query(f"SELECT count(*) FROM dataset{where}", parameters, lambda result: result.fetchone()[0])
+
+    def page(self, conditions: list, columns: list, sort_column: str | None, descending: bool, offset: int, limit: int):
+        where, parameters = self._where(conditions)
+        order = f" ORDER BY {_quote(sort_column)} {'DESC' if descending else 'ASC'} NULLS LAST" if sort_column else ''
+        sql = f"SELECT {', '.join(map(_quote, columns))} FROM dataset{where}{order} LIMIT {int(limit)} OFFSET {int(offset)}"
+        return self._query(sql, parameters, lambda result: result.fetch_arrow_table())
+
+    def value_counts(self, column: str) -> pd.Series:
+        quoted = _quote(column)
+        counts = self._query(f"SELECT {quoted} AS value, count(*) AS count FROM dataset WHERE {quoted} IS NOT NULL "
+                             f"GROUP BY {quoted} ORDER BY count DESC")
+        return pd.Series(counts['count'].to_numpy(), index = pd.Index(counts['value'], name = column), name = 'count')
+
+    def group_statistics(self, category: str, numeric: str) -> GroupStats:
+        label, value = _quote(category), f"CAST({_quote(numeric)} AS DOUBLE)"
+        quantiles = ''.join(f', quantile_cont(v, {q}) AS "q{q}"' for q in GROUP_QUANTILES)
+        frame = self._query(f'''
+            SELECT {label} AS label,
+                   count(*) AS count,
+                   avg(v) AS mean,
+                   var_pop(v) * count(*) AS m2,
+                   min(v) AS minimum,
+                   max(v) AS maximum{quantiles}
+            FROM (SELECT {label}, {value} AS v FROM dataset)
+            WHERE {label} IS NOT NULL AND v IS NOT NULL AND NOT isnan(v)
+            GROUP BY {label}
+        ''')
+        return _group_stats(frame)
+#------------------------------------------------------------------------------------------------------#
+
+class PolarsBackend(QueryBackend):
+    engine = 'polars'
+
+    def __init__(self, source, file_format: str | None = None, csv_kinds: dict | None = None):
+        import polars as pl
+
+        self._pl = pl
+        if isinstance(source, pd.DataFrame):
+            self._frame = pl.from_pandas(source).lazy()
+        elif file_format == 'parquet':
+            self._frame = pl.scan_parquet(source)
+        elif file_format == 'csv':
+            csv_kinds = csv_kinds or {}
+            self._frame = (pl.scan_csv(source, schema_overrides = {column: pl.String for column in csv_kinds})
+                           .with_columns(pl.col(column).str.to_datetime(strict = False)
+                                         for column, kind in csv_kinds.items() if kind == 'datetime'))
+        elif is_ipc_file_format(source):
+            self._frame = pl.scan_ipc(source)
+        else:
+            self._frame = pl.read_ipc_stream(source).lazy()
+        self._kinds = {name: self._kind(dtype) for name, dtype in self._frame.collect_schema().items()}
+
+    def _kind(self, dtype) -> str:
+        pl = self._pl
+        if dtype == pl.Boolean:
+            return 'bool'
+        if dtype.is_integer():
+            return 'int'
+        if dtype.is_float() or dtype.is_decimal():
+            return 'float'
+        if dtype == pl.String:
+            return 'str'
+        if dtype == pl.Date or isinstance(dtype, pl.Datetime):
+            return 'datetime'
+        return 'other'
+
+    def _filtered(self, conditions: list):
+        pl = self._pl
+        frame = self._frame
+        for condition in conditions:
+            column = pl.col(condition.column)
+            if condition.bounds is not None:
+                frame = frame.filter(column.is_between(*condition.bounds))
+                continue
+            kind = self._kinds.get(condition.column, 'other')
+            if kind == 'other':
+                column = column.cast(pl.String)
+            frame = frame.filter(column.is_in(_typed_labels(condition.values, kind)))
+        return frame
+
+    def count(self, conditions: list) -> int:
+        return self._filtered(conditions).select(self._pl.len()).collect().item()
+
+    def page(self, conditions: list, columns: list, sort_column: str | None, descending: bool, offset: int, limit: int):
+        frame = self._filtered(conditions)
+        if sort_column:
+            frame = frame.sort(sort_column, descending = descending, nulls_last = True, maintain_order = True)
+        return frame.select(columns).slice(offset, limit).collect().to_arrow()
+
+    def value_counts(self, column: str) -> pd.Series:
+        pl = self._pl
+        counts = (self._frame.select(column).drop_nulls().group_by(column).agg(pl.len().alias('count'))
+                  .sort('count', descending = True).collect())
+        return pd.Series(counts['count'].to_numpy(), index = pd.Index(counts[column].to_list(), name = column), name = 'count')
+
+    def group_statistics(self, category: str, numeric: str) -> GroupStats:
+        pl = self._pl
+        value = pl.col(numeric).cast(pl.Float64)
+        frame = (self._frame
+                 .select(pl.col(category).alias('label'), value.alias('v'))
+                 .filter(pl.col('label').is_not_null() & pl.col('v').is_not_null() & pl.col('v').is_not_nan())
+                 .group_by('label')
+                 .agg(pl.len().alias('count'),
+                      pl.col('v').mean().alias('mean'),
+                      (pl.col('v').var(ddof = 0) * pl.len()).alias('m2'),
+                      pl.col('v').min().alias('minimum'),
+                      pl.col('v').max().alias('maximum'),
+                      *[pl.col('v').quantile(q, interpolation = 'linear').alias(f'q{q}') for q in GROUP_QUANTILES])
+                 .collect())
+        return _group_stats(frame.to_pandas())
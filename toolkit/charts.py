@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import functools
+import importlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from toolkit.plotting import binned_kde_2d, density_hexbin, kde_levels, partition_xy
+#------------------------------------------------------------------------------------------------------#
+
+# Heavy modules imported ahead of their first use by the optional preload hook
+PRELOAD_MODULES = ('matplotlib.pyplot', 'seaborn', 'scipy.stats', 'scipy.signal', 'scipy.cluster.hierarchy', 'pyarrow.parquet')
+
+_theme_applied = False
+#------------------------------------------------------------------------------------------------------#
+
+# The slow figures of the Plot tabs, as module-level functions so the job runner can draw them in a worker process
+
+def apply_theme():
+    # Page & worker initializer: the whole look without a GUI backend, set up once per process
+    global _theme_applied
+    if _theme_applied:
+        return
+    import matplotlib
+    import seaborn as sns
+
+    matplotlib.use('Agg')
+    sns.set_theme(style = "whitegrid")
+    _theme_applied = True
+
+
+def preload(modules: tuple = ()):
+    # Import the plotting stack (and `modules`) and apply the theme, so the first plot or job pays no import time
+    apply_theme()
+    for name in PRELOAD_MODULES + tuple(modules):
+        importlib.import_module(name)
+
+
+def density_grid(df: pd.DataFrame, category_column: str, x: str, y: str, categories: list, large_mode: bool,
+                 folded: int = 0, progress = None):
+    '''
+    One 2D density (or hexbin in large-n mode) per category, two per row, plus one panel pooling
+    the `folded` other categories. Groups are partitioned once, the densities of every panel
+    are evaluated in parallel threads (numpy / FFT release the GIL), then the panels are drawn.
+    '''
+    import matplotlib.pyplot as plt
+
+    groups = partition_xy(df[category_column], df[x], df[y], categories, fold_other = bool(folded))
+    titles = [f'{category_column}: {category}' for category in categories]
+    if folded:
+        titles.append(f'{category_column}: other ({folded} categories)')
+
+    densities = [None] * len(groups)
+    if not large_mode:
+        with ThreadPoolExecutor(max_workers = min(len(groups), os.cpu_count() or 1) or 1) as pool:
+            futures = {pool.submit(binned_kde_2d, xs, ys): i for i, (xs, ys) in enumerate(groups)}
+            for done, future in enumerate(as_completed(futures)):
+                densities[futures[future]] = future.result()
+                if progress is not None:
+                    progress(0.8 * (done + 1) / len(groups), f"Density {done + 1} of {len(groups)}")
+
+    cols = 2
+    rows = (len(groups) + cols - 1) // cols
+    fig, axes = plt.subplots(rows, cols, figsize = (12, 6 * rows), constrained_layout = True)
+    axes = axes.flatten()
+
+    for ax, title, (xs, ys), density in zip(axes, titles, groups, densities):
+        if large_mode:
+            density_hexbin(xs, ys, ax = ax, cmap = "Greens")
+        elif density is not None:  # too few or collinear points draw an empty panel, as `warn_singular = False`
+            x_grid, y_grid, values = density
+            ax.contourf(x_grid, y_grid, values.T, levels = kde_levels(values), cmap = "Greens")
+        ax.set_title(title)
+        ax.set_xlabel(x)
+        ax.set_ylabel(y)
+
+    # Hide unused subplots
+    for i in range(len(groups), len(axes)):
+        axes[i].axis('off')
+    return fig
+
+
+class _PanelProgress:
+    '''
+    Wraps seaborn plotting functions so every panel (or hue level) they draw first reports progress:
+    a cancelled job then stops at its next panel instead of after the whole grid.
+    '''
+
+    def __init__(self, progress, total: int, label: str):
+        self.progress = progress
+        self.total = max(total, 1)
+        self.label = label
+        self.done = 0
+
+    def wrap(self, plot):
+        @functools.wraps(plot)  # seaborn inspects the signature (e.g. for `hue`) through __wrapped__
+        def draw(*args, **kwargs):
+            if self.progress is not None:
+                self.progress(0.05 + 0.85 * self.done / self.total, f"{self.label} {self.done + 1} of {self.total}")
+            self.done += 1
+            return plot(*args, **kwargs)
+        return draw
+
+
+def regression_grid(df: pd.DataFrame, category_column: str, x: str, y: str, progress = None):
+    # `sns.lmplot(hue = category_column, height = 5, aspect = 1.5)`, one regression (and its bootstrap) per category at a time
+    import seaborn as sns
+
+    grid = sns.FacetGrid(df, hue = category_column, height = 5, aspect = 1.5)
+    grid.hue_kws = {'marker': ['o'] * len(grid.hue_names or [None])}
+    panels = _PanelProgress(progress, len(grid.hue_names or [None]), "Regression")
+    grid.map_dataframe(panels.wrap(sns.regplot), x = x, y = y, truncate = True)
+    grid.set_axis_labels(x, y)
+    grid.add_legend()
+    return grid
+
+
+def pair_grid(df: pd.DataFrame, category_column: str, columns: list, progress = None):
+    # `sns.pairplot(corner = True)` drawn panel by panel: KDEs on the diagonal, scatters below
+    import seaborn as sns
+
+    grid = sns.PairGrid(df, hue = category_column, vars = columns, corner = True, diag_sharey = False)
+    panels = _PanelProgress(progress, len(columns) * (len(columns) + 1) // 2, "Panel")
+    grid.map_diag(panels.wrap(sns.kdeplot), legend = False, fill = True, warn_singular = False)
+    grid.map_offdiag(panels.wrap(sns.scatterplot), alpha = 0.7)
+    grid.add_legend()
+    grid.tight_layout()
+    return grid
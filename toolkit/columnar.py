@@ -0,0 +1,92 @@
+import os
+
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+# File extension -> reader used for it
+FILE_FORMATS = {
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'pq': 'parquet',
+    'feather': 'feather',
+    'arrow': 'arrow',
+    'ipc': 'arrow',
+    'arrows': 'arrow',
+}
+COLUMNAR_FORMATS = ('parquet', 'feather', 'arrow')
+
+# Directory scanned for server-side files, opened memory-mapped instead of uploaded
+DATA_DIR = os.environ.get('EDA_DATA_DIR', 'data')
+
+_ARROW_FILE_MAGIC = b'ARROW1'
+#------------------------------------------------------------------------------------------------------#
+
+def detect_format(file_name: str) -> str:
+    extension = os.path.splitext(file_name)[1].lstrip('.').lower()
+    if extension not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file type: '{extension}'")
+    return FILE_FORMATS[extension]
+
+
+def list_server_files(data_dir: str = DATA_DIR) -> list:
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(name for name in os.listdir(data_dir)
+                  if os.path.splitext(name)[1].lstrip('.').lower() in FILE_FORMATS)
+
+
+def server_file_fingerprint(path: str) -> str:
+    # A server-side file is identified by its path and last modification, not by hashing its content
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _open(source):
+    # Paths are memory-mapped and uploads are wrapped without copying, so columns are only read when projected
+    import pyarrow as pa
+
+    if isinstance(source, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(source), 'r')
+    return pa.BufferReader(source)
+
+
+def is_ipc_file_format(source) -> bool:
+    # Arrow IPC *file* format (Feather v2, .arrow) rather than the footer-less *stream* format (.arrows)
+    handle = _open(source)
+    return handle.read(len(_ARROW_FILE_MAGIC)) == _ARROW_FILE_MAGIC
+
+
+def open_ipc_reader(source):
+    import pyarrow as pa
+
+    handle = _open(source)
+    return pa.ipc.open_file(handle) if is_ipc_file_format(source) else pa.ipc.open_stream(handle)
+
+
+def read_schema(source, file_format: str):
+    # Column names & types, read from the file footer / header only
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(_open(source))
+    # Feather v2 is the Arrow IPC file format
+    return open_ipc_reader(source).schema
+
+
+def read_columnar(source, file_format: str, columns: list = None) -> pd.DataFrame:
+    '''
+    Read a Parquet / Feather / Arrow IPC file into pandas, materializing only `columns`.
+    `source` is either a path on the server (memory-mapped) or the raw bytes of an upload.
+    '''
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(_open(source), columns = columns)
+    elif file_format == 'feather':
+        import pyarrow.feather as feather
+        table = feather.read_table(_open(source), columns = columns, memory_map = False)
+    elif file_format == 'arrow':
+        table = open_ipc_reader(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    else:
+        raise ValueError(f"'{file_format}' is not a columnar format")
+    return table.to_pandas(split_blocks = True)
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+CHUNK_ROWS = 250_000             # rows converted to float at a time, so wide frames are never copied whole
+VIF_SAMPLE_ROWS = 1_000_000      # row sample used by the optional sampling mode of the VIF
+SINGULAR_TOLERANCE = 1e-10       # eigenvalues below this share of the largest one are treated as exact collinearity
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class Scatter:
+    # Moments of the complete rows (no missing value in any column) of a numeric frame
+    n: int
+    mean: np.ndarray
+    scatter: np.ndarray          # sum of outer products of the centered rows
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(np.diag(self.scatter) / (self.n - 1))
+
+
+def scatter_matrix(frame: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Scatter:
+    '''
+    Accumulate X'X chunk by chunk (one BLAS product per chunk) around a shift taken from the first chunk,
+    which keeps the centered result accurate without materializing a float copy of the whole frame.
+    '''
+    p = frame.shape[1]
+    n, shift = 0, None
+    total = np.zeros(p)
+    cross = np.zeros((p, p))
+    for start in range(0, len(frame), chunk_rows):
+        values = frame.iloc[start:start + chunk_rows].to_numpy(dtype = float, na_value = np.nan)
+        values = values[~np.isnan(values).any(axis = 1)]
+        if not len(values):
+            continue
+        if shift is None:
+            shift = values.mean(axis = 0)
+        values = values - shift
+        n += len(values)
+        total += values.sum(axis = 0)
+        cross += values.T @ values
+    if n == 0:
+        return Scatter(0, np.full(p, np.nan), np.full((p, p), np.nan))
+    offset = total / n
+    return Scatter(n, shift + offset, cross - n * np.outer(offset, offset))
+#------------------------------------------------------------------------------------------------------#
+
+def _symmetric_inverse(matrix: np.ndarray):
+    # Pseudo-inverse through the eigendecomposition, plus a flag per column touching a null direction
+    eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+    null = eigenvalues <= SINGULAR_TOLERANCE * max(eigenvalues.max(), 0)
+    kept = eigenvectors[:, ~null]
+    inverse = (kept / eigenvalues[~null]) @ kept.T
+    collinear = (np.abs(eigenvectors[:, null]) > 1e-8).any(axis = 1)
+    return inverse, collinear
+
+
+def sample_frame(frame: pd.DataFrame, sample_rows: int | None = None, seed: int = 0) -> pd.DataFrame:
+    # Uniform row sample (in row order) of at most `sample_rows` rows; the frame itself when it is small enough
+    if sample_rows is not None and len(frame) > sample_rows:
+        rng = np.random.default_rng(seed)
+        frame = frame.iloc[np.sort(rng.choice(len(frame), sample_rows, replace = False))]
+    return frame
+
+
+def vif_moments(frame: pd.DataFrame, sample_rows: int | None = None, seed: int = 0) -> Scatter:
+    # The moments the VIF is computed from (a p x p matrix)
+    return scatter_matrix(sample_frame(frame, sample_rows, seed))
+
+
+def vif_from_moments(moments: Scatter, columns: list) -> pd.DataFrame:
+    '''
+    VIF of every column (and of the intercept, as `statsmodels` reports with `add_constant`) in closed form:
+    the diagonal of the inverse correlation matrix, instead of one OLS fit per column.
+    Exactly collinear or constant columns get an infinite VIF; with fewer than two complete rows every VIF is NaN.
+    '''
+    if moments.n < 2:
+        return pd.DataFrame({'feature': ['const'] + list(columns), 'VIF': np.nan})
+
+    vif = np.full(len(columns), np.inf)
+    const_vif = np.nan
+
+    std = moments.std
+    varying = std > 0
+    if varying.any():
+        scale = std[varying]
+        correlation = moments.scatter[np.ix_(varying, varying)] / np.outer(scale, scale) / (moments.n - 1)
+        inverse, collinear = _symmetric_inverse(correlation)
+        vif[varying] = np.where(collinear, np.inf, np.diag(inverse))
+
+        # Intercept: 1 / (1 - uncentered R²) of regressing the constant on the columns = 1 + n/(n-1) * z' R⁻¹ z
+        z = moments.mean[varying] / scale
+        const_vif = 1 + moments.n / (moments.n - 1) * float(z @ inverse @ z)
+
+    return pd.DataFrame({'feature': ['const'] + list(columns), 'VIF': np.concatenate(([const_vif], vif))})
+
+
+def variance_inflation_factors(frame: pd.DataFrame, sample_rows: int | None = None, seed: int = 0) -> pd.DataFrame:
+    return vif_from_moments(vif_moments(frame, sample_rows, seed), list(frame.columns))
+#------------------------------------------------------------------------------------------------------#
+
+CORRELATION_METHODS = ('pearson', 'spearman', 'kendall')
+KENDALL_SAMPLE_ROWS = 20_000     # Kendall's tau is quadratic in n: it always runs on a row sample
+ANNOT_MAX_COLUMNS = 30           # heatmaps wider than this are drawn without cell annotations
+
+
+def _masked_correlation(frame: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    '''
+    Pairwise-complete Pearson correlation (as `DataFrame.corr`) from four matrix products per chunk:
+    with M the not-null mask and X the zero-filled values, n = M'M, Σx = X'M, Σx² = (X²)'M and Σxy = X'X.
+    '''
+    p = frame.shape[1]
+    shift = np.nan_to_num(frame.mean().to_numpy(dtype = float))  # centering keeps the sums of squares well conditioned
+    count, sums, squares, cross = (np.zeros((p, p)) for _ in range(4))
+    for start in range(0, len(frame), chunk_rows):
+        values = frame.iloc[start:start + chunk_rows].to_numpy(dtype = float, na_value = np.nan) - shift
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+        values = np.where(present, values, 0.0)
+        count += mask.T @ mask
+        sums += values.T @ mask
+        squares += (values * values).T @ mask
+        cross += values.T @ values
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        covariance = cross - sums * sums.T / count
+        variance = squares - sums * sums / count
+        correlation = covariance / np.sqrt(variance * variance.T)
+    return np.clip(correlation, -1, 1)
+
+
+def correlation_matrix(frame: pd.DataFrame, method: str = 'pearson', sample_rows: int | None = None, seed: int = 0) -> pd.DataFrame:
+    '''
+    Correlation matrix of the numeric columns of `frame`.
+    Pearson (and Spearman, as Pearson on ranks) use one BLAS pass when there is no missing value
+    and a masked pairwise-complete pass otherwise. With missing values Spearman ranks each column
+    once over all its values, a close approximation of pandas' per-pair ranking.
+    '''
+    if method == 'kendall':
+        sample_rows = min(sample_rows or KENDALL_SAMPLE_ROWS, KENDALL_SAMPLE_ROWS)
+    frame = sample_frame(frame, sample_rows, seed)
+    if method == 'kendall':
+        return frame.corr(method = 'kendall')
+    if method == 'spearman':
+        frame = frame.rank()
+
+    if frame.isna().to_numpy().any():
+        correlation = _masked_correlation(frame)
+    else:
+        moments = scatter_matrix(frame)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            correlation = np.clip(moments.scatter / np.outer(moments.std, moments.std) / (moments.n - 1), -1, 1)
+    np.fill_diagonal(correlation, np.where(np.isnan(np.diag(correlation)), np.nan, 1.0))
+    return pd.DataFrame(correlation, index = frame.columns, columns = frame.columns)
+#------------------------------------------------------------------------------------------------------#
+
+def cluster_order(correlation: pd.DataFrame) -> list:
+    # Columns reordered by average-linkage clustering on 1 - |r|, so correlated blocks sit together
+    from scipy.cluster.hierarchy import leaves_list, linkage
+    from scipy.spatial.distance import squareform
+
+    if len(correlation) < 3:
+        return list(correlation.columns)
+    distance = 1 - np.abs(np.nan_to_num(correlation.to_numpy(), nan = 0.0))
+    distance = (distance + distance.T) / 2
+    np.fill_diagonal(distance, 0)
+    order = leaves_list(linkage(squareform(np.clip(distance, 0, None), checks = False), method = 'average'))
+    return [correlation.columns[i] for i in order]
+
+
+def strongest_pairs(correlation: pd.DataFrame, k: int = 10) -> pd.DataFrame:
+    # The k pairs of distinct columns with the largest |r|
+    rows, cols = np.tril_indices(len(correlation), k = -1)
+    values = correlation.to_numpy()[rows, cols]
+    keep = ~np.isnan(values)
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+    top = np.argsort(-np.abs(values), kind = 'stable')[:k]
+    return pd.DataFrame({
+        'Variable 1': correlation.columns[rows[top]],
+        'Variable 2': correlation.columns[cols[top]],
+        'Correlation': values[top],
+    })
@@ -0,0 +1,47 @@
+import inspect
+import io
+import os
+#------------------------------------------------------------------------------------------------------#
+
+# Figures are shown with `st.image`, which only decodes raster images: vector formats are not offered
+RASTER_FORMATS = ('png', 'jpeg', 'webp')
+FIGURE_FORMAT = os.environ.get('EDA_FIGURE_FORMAT', 'png').lower()
+if FIGURE_FORMAT not in RASTER_FORMATS:
+    raise ValueError(f"EDA_FIGURE_FORMAT must be one of {', '.join(RASTER_FORMATS)}, not '{FIGURE_FORMAT}'")
+FIGURE_DPI = 200                                              # same resolution as `st.pyplot`
+#------------------------------------------------------------------------------------------------------#
+
+def render_figure(figure, file_format: str = FIGURE_FORMAT, dpi: int = FIGURE_DPI) -> bytes:
+    '''
+    Render a matplotlib Figure (or a seaborn FacetGrid / PairGrid) to PNG (or JPEG / WebP) bytes and close it,
+    so figures never pile up in pyplot's global registry between reruns.
+    '''
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+
+    if not isinstance(figure, Figure):
+        figure = figure.figure
+    buffer = io.BytesIO()
+    try:
+        figure.savefig(buffer, format = file_format, dpi = dpi, bbox_inches = 'tight')
+    finally:
+        plt.close(figure)
+    return buffer.getvalue()
+
+
+def cached_render(cache, key, build, file_format: str = FIGURE_FORMAT) -> bytes:
+    # `build()` draws the figure; it only runs when `key` is not in the LRU `cache` yet
+    image = cache.get((key, file_format))
+    if image is None:
+        image = cache.put((key, file_format), render_figure(build(), file_format))
+    return image
+
+
+def render_job(draw, *args, progress = None, file_format: str = FIGURE_FORMAT, **kwargs) -> bytes:
+    # Draw with a module-level `draw` function and render it in one go, e.g. inside a worker process
+    if progress is not None and 'progress' in inspect.signature(draw).parameters:
+        kwargs['progress'] = progress
+    figure = draw(*args, **kwargs)
+    if progress is not None:
+        progress(0.95, 'Rendering ...')
+    return render_figure(figure, file_format)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class Condition:
+    # Either keep rows whose value (as shown in the UI, i.e. str) is in `values`,
+    # or rows whose numeric value lies within `bounds` (inclusive)
+    column: str
+    values: list | None = None
+    bounds: tuple | None = None
+
+    def describe(self) -> str:
+        if self.bounds is not None:
+            return f"{self.column} ∈ [{self.bounds[0]}, {self.bounds[1]}]"
+        return f"{self.column} ∈ {{{', '.join(map(str, self.values))}}}"
+
+
+def _position_dtype(n_rows: int):
+    return np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+
+
+class ColumnIndex:
+    '''
+    Inverted index of one column: every distinct value maps to the (sorted) row positions holding it,
+    so an equality / membership filter costs O(matches) instead of a full scan of the column.
+    Both the inverted index and the sorted view used by range filters are built on first use.
+    '''
+
+    def __init__(self, series: pd.Series):
+        self.n_rows = len(series)
+        self._values = series
+        self._positions = None         # inverted index: row positions grouped by code ...
+        self._offsets = None           # ... where each code's group starts
+        self._codes_by_label = {}      # label (as shown in the UI) -> codes
+        self._sorted_positions = None  # sorted view: positions of the non-missing values in value order ...
+        self._sorted_values = None     # ... and those values
+
+    @property
+    def nbytes(self) -> int:
+        # Memory of the built indexes (the column itself belongs to the frame)
+        arrays = [self._positions, self._offsets, self._sorted_positions, self._sorted_values]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def _build_inverted(self):
+        series = self._values
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series, sort = False)
+        codes = codes.astype(np.int64) + 1  # 0 now stands for missing values
+
+        # Row positions grouped by code; a stable sort keeps them ascending inside each group
+        self._positions = np.argsort(codes, kind = 'stable').astype(_position_dtype(self.n_rows))
+        self._offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength = len(uniques) + 1))))
+
+        # The UI shows values as strings; several raw values may share one label (e.g. 1 and '1')
+        self._codes_by_label = {}
+        for code, value in enumerate(uniques, start = 1):
+            self._codes_by_label.setdefault(str(value), []).append(code)
+
+    def positions_of(self, labels: list) -> np.ndarray:
+        if self._positions is None:
+            self._build_inverted()
+        slices = [self._positions[self._offsets[code]:self._offsets[code + 1]]
+                  for label in labels for code in self._codes_by_label.get(str(label), [])]
+        if not slices:
+            return np.empty(0, dtype = self._positions.dtype)
+        if len(slices) == 1:
+            return slices[0]
+        return np.sort(np.concatenate(slices))
+
+    def _build_sorted(self):
+        values = pd.to_numeric(self._values, errors = 'coerce').to_numpy(dtype = float)
+        order = np.argsort(values, kind = 'stable')  # NaNs sort last
+        n_valid = int(np.count_nonzero(~np.isnan(values)))
+        self._sorted_positions = order[:n_valid].astype(_position_dtype(self.n_rows))
+        self._sorted_values = values[self._sorted_positions]
+
+    def positions_between(self, low, high) -> np.ndarray:
+        if self._sorted_positions is None:
+            self._build_sorted()
+        start = np.searchsorted(self._sorted_values, low, side = 'left')
+        stop = np.searchsorted(self._sorted_values, high, side = 'right')
+        return np.sort(self._sorted_positions[start:stop])
+#------------------------------------------------------------------------------------------------------#
+
+def intersect_positions(position_sets: list) -> np.ndarray:
+    # Start from the most selective set so every intersection stays small
+    position_sets = sorted(position_sets, key = len)
+    result = position_sets[0]
+    for positions in position_sets[1:]:
+        if len(result) == 0:
+            break
+        result = np.intersect1d(result, positions, assume_unique = True)
+    return result
+
+
+def filter_positions(get_index, conditions: list, n_rows: int) -> np.ndarray:
+    '''
+    Row positions matching all `conditions`. `get_index(column)` returns the (cached) ColumnIndex of a column.
+    '''
+    position_sets = []
+    for condition in conditions:
+        index = get_index(condition.column)
+        if condition.bounds is not None:
+            position_sets.append(index.positions_between(*condition.bounds))
+        else:
+            position_sets.append(index.positions_of(condition.values))
+    if not position_sets:
+        return np.arange(n_rows)
+    return intersect_positions(position_sets)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+PAGE_SIZES = (25, 100, 500, 1_000)
+DEFAULT_PAGE_SIZE = 100
+#------------------------------------------------------------------------------------------------------#
+
+def sort_positions(series: pd.Series, ascending: bool = True) -> np.ndarray:
+    # Row positions of the whole column in sorted order (stable, missing values last), computed once per column
+    order = series.reset_index(drop = True).sort_values(ascending = ascending, kind = 'stable', na_position = 'last')
+    return order.index.to_numpy()
+
+
+def restrict_order(order: np.ndarray, positions: np.ndarray, n_rows: int) -> np.ndarray:
+    # Sorted order of a subset of rows, read off the sorted order of the whole column in O(n)
+    keep = np.zeros(n_rows, dtype = bool)
+    keep[positions] = True
+    return order[keep[order]]
+
+
+def page_count(n_rows: int, page_size: int) -> int:
+    return max(1, -(-n_rows // page_size))
+
+
+def page_rows(positions: np.ndarray | None, n_rows: int, page: int, page_size: int) -> np.ndarray:
+    # Row positions shown on `page` (0-based); `positions` is the row order, None meaning the frame's own order
+    start = page * page_size
+    if positions is None:
+        return np.arange(start, min(start + page_size, n_rows))
+    return positions[start:start + page_size]
+
+
+def arrow_page(df: pd.DataFrame, rows: np.ndarray, columns: list):
+    '''
+    Arrow table of a window of `df`: rows are taken first, then columns,
+    so only the visible cells are ever copied and serialized to the browser.
+    '''
+    import pyarrow as pa
+
+    column_positions = [df.columns.get_loc(column) for column in columns]
+    window = df.iloc[rows, column_positions]
+    return pa.Table.from_pandas(window, preserve_index = True)
@@ -0,0 +1,154 @@
+import io
+import os
+import warnings
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from toolkit.loading import frame_nbytes
+#------------------------------------------------------------------------------------------------------#
+
+SAMPLE_ROWS = 20_000                 # rows sniffed to decide the dtype of each column
+CHUNK_ROWS = 250_000                 # rows parsed per chunk
+CATEGORY_MAX_LEVELS = 2_000          # strings with fewer distinct values become `category`
+CATEGORY_MAX_RATIO = 0.5             # ... as long as they repeat on average at least twice
+MEMORY_BUDGET = 2 * 1024 ** 3        # bytes of parsed data held before the read is truncated
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class CsvPlan:
+    # Per-column decisions taken from the sample, applied to every chunk
+    category_columns: list = field(default_factory = list)
+    datetime_columns: list = field(default_factory = list)
+
+    @property
+    def dtypes(self) -> dict:
+        return {col: 'category' for col in self.category_columns}
+
+
+def _looks_like_datetime(values: pd.Series) -> bool:
+    probe = values.head(500)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        parsed = pd.to_datetime(probe, errors = 'coerce')
+    return bool(parsed.notna().all())
+
+
+def infer_csv_plan(sample: pd.DataFrame) -> CsvPlan:
+    plan = CsvPlan()
+    for col in sample.columns:
+        values = sample[col]
+        if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+            continue
+        non_null = values.dropna()
+        if non_null.empty:
+            continue
+        if _looks_like_datetime(non_null):
+            plan.datetime_columns.append(col)
+            continue
+        n_unique = non_null.nunique()
+        if n_unique <= CATEGORY_MAX_LEVELS and n_unique <= CATEGORY_MAX_RATIO * len(non_null):
+            plan.category_columns.append(col)
+    return plan
+
+
+def downcast_numeric(series: pd.Series) -> pd.Series:
+    # Integers always shrink losslessly; floats only go to float32 when no value changes
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast = 'integer')
+    if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+        narrowed = series.astype(np.float32)
+        same = (narrowed.astype(series.dtype) == series) | series.isna()
+        if bool(same.all()):
+            return narrowed
+    return series
+
+
+def compact_chunk(chunk: pd.DataFrame, plan: CsvPlan) -> pd.DataFrame:
+    for col in chunk.columns:
+        if col in plan.datetime_columns:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                chunk[col] = pd.to_datetime(chunk[col], errors = 'coerce')
+        elif pd.api.types.is_numeric_dtype(chunk[col]):
+            chunk[col] = downcast_numeric(chunk[col])
+    return chunk
+
+
+def concat_chunks(chunks: list, plan: CsvPlan) -> pd.DataFrame:
+    if len(chunks) == 1:
+        return chunks[0]
+    # Each chunk has its own category levels; union them instead of falling back to object
+    categoricals = {}
+    for col in plan.category_columns:
+        parts = [chunk[col] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            categoricals[col] = union_categoricals(parts)
+    df = pd.concat([chunk.drop(columns = list(categoricals)) for chunk in chunks], ignore_index = True)
+    for col, values in categoricals.items():
+        df[col] = pd.Categorical(values)
+    return df[chunks[0].columns]
+
+
+def _open_csv(source):
+    # (handle, size) of a CSV given as raw bytes or as a path; a path is read chunk by chunk, never as a whole
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source), len(source)
+    return open(source, 'rb'), os.path.getsize(source)
+
+
+def read_csv_chunked(source,
+                     chunk_rows: int = CHUNK_ROWS,
+                     memory_budget: int = MEMORY_BUDGET,
+                     progress = None,
+                     **kwargs) -> pd.DataFrame:
+    '''
+    Stream a CSV (raw bytes or a path) into a compact frame: dtypes are inferred from a sample,
+    then the file is parsed chunk by chunk until it ends or the memory budget is spent.
+    `progress(fraction)` is called after every chunk.
+    If the budget is hit, `df.attrs['truncated']` is set to True.
+    '''
+    handle, size = _open_csv(source)
+    with handle:
+        sample = pd.read_csv(handle, nrows = SAMPLE_ROWS, **kwargs)
+        plan = infer_csv_plan(sample)
+        handle.seek(0)
+
+        chunks, used, truncated = [], 0, False
+        with pd.read_csv(handle, chunksize = chunk_rows, dtype = plan.dtypes, **kwargs) as reader:
+            for chunk in reader:
+                chunk = compact_chunk(chunk, plan)
+                chunks.append(chunk)
+                used += frame_nbytes(chunk)
+                if progress is not None:
+                    progress(min(handle.tell() / max(size, 1), 1.0))
+                if used > memory_budget:
+                    # Peek a single row to tell a full file from a cut-off one
+                    try:
+                        reader.get_chunk(1)
+                        truncated = True
+                    except StopIteration:
+                        pass
+                    break
+
+    df = concat_chunks(chunks, plan) if chunks else sample.iloc[0:0]
+    df.attrs['truncated'] = truncated
+    return df
+
+
+def iter_csv_chunks(source, chunk_rows: int = CHUNK_ROWS, **kwargs):
+    '''
+    Yield the compacted chunks of a whole CSV (path or raw bytes) one at a time, without keeping them,
+    for single-pass consumers such as the streaming summary of a file larger than the memory budget.
+    '''
+    def handle():
+        return io.BytesIO(source) if isinstance(source, bytes) else source
+
+    plan = infer_csv_plan(pd.read_csv(handle(), nrows = SAMPLE_ROWS, **kwargs))
+    with pd.read_csv(handle(), chunksize = chunk_rows, dtype = plan.dtypes, **kwargs) as reader:
+        for chunk in reader:
+            yield compact_chunk(chunk, plan)
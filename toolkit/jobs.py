@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import atexit
+import inspect
+import os
+import sys
+import threading
+import types
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+
+from toolkit.loading import DatasetCache
+#------------------------------------------------------------------------------------------------------#
+
+# Worker processes shared by every session; a small pool keeps one user from taking every core
+JOB_WORKERS = int(os.environ.get('EDA_JOB_WORKERS', min(4, os.cpu_count() or 1)))
+#------------------------------------------------------------------------------------------------------#
+
+class JobCancelled(Exception):
+    pass
+
+
+class Progress:
+    '''
+    Handed to job functions that take a `progress` argument: `progress(fraction, text)` publishes
+    how far the job is through a manager dict, and raises JobCancelled once the job was cancelled.
+    '''
+
+    def __init__(self, shared, job_id: str):
+        self._shared = shared
+        self._job_id = job_id
+
+    def __call__(self, fraction: float, text: str = ''):
+        if self._shared.get(('cancel', self._job_id)):
+            raise JobCancelled(self._job_id)
+        self._shared[self._job_id] = (float(fraction), text)
+
+
+@contextmanager
+def _neutral_main():
+    # Streamlit runs the page as `__main__` and spawned children re-import `__main__`:
+    # while processes start, swap in an empty module so workers do not re-run the whole app
+    main = sys.modules.get('__main__')
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+def _execute(shared, job_id: str, fn, args: tuple, kwargs: dict):
+    # Runs in the worker process
+    if 'progress' in inspect.signature(fn).parameters:
+        kwargs = dict(kwargs, progress = Progress(shared, job_id))
+    return fn(*args, **kwargs)
+
+
+def _noop():
+    pass
+
+
+class Job:
+    def __init__(self, key, future: Future, job_id: str = None, shared = None):
+        self.key = key
+        self.future = future
+        self.job_id = job_id
+        self._shared = shared
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def progress(self) -> tuple:
+        if self.future.done():
+            return 1.0, ''
+        if self._shared is None:
+            return 0.0, ''
+        return self._shared.get(self.job_id, (0.0, 'Queued ...'))
+
+    def cancelled(self) -> bool:
+        if self.future.cancelled():
+            return True
+        return self.future.done() and isinstance(self.future.exception(), JobCancelled)
+
+    def exception(self):
+        return None if self.cancelled() else self.future.exception()
+
+    def result(self):
+        return self.future.result()
+
+
+class JobRunner:
+    '''
+    Runs heavy analyses in a pool of worker processes (spawned, so no state of the app is forked),
+    off the Streamlit script thread and outside its GIL.
+    Each caller `slot` (session & analysis) has at most one live job: submitting a new key to a slot
+    cancels its previous job, unless another slot still waits for it. Finished results are cached by key.
+    '''
+
+    def __init__(self, max_workers: int = JOB_WORKERS, initializer = None, results: DatasetCache = None):
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.results = results if results is not None else DatasetCache(max_entries = 64, max_bytes = 512 * 1024 ** 2)
+        self._executor = None
+        self._manager = None
+        self._shared = None
+        self._jobs = {}    # key -> live Job
+        self._slots = {}   # slot -> key of its latest job
+        self._lock = threading.RLock()   # a cancelled future runs its done callback right away
+
+    def _start(self):
+        # The pool and the manager process are only started by the first job
+        import multiprocessing
+
+        context = multiprocessing.get_context('spawn')
+        with _neutral_main():
+            self._manager = context.Manager()
+        self._shared = self._manager.dict()
+        self._executor = ProcessPoolExecutor(max_workers = self.max_workers, mp_context = context, initializer = self.initializer)
+        atexit.register(self.shutdown)
+
+    def warm_up(self, fn = None) -> list:
+        # Start the pool and all of its worker processes before the first job; each worker then runs `fn()`
+        with self._lock:
+            if self._executor is None:
+                self._start()
+            with _neutral_main():
+                return [self._executor.submit(fn or _noop) for _ in range(self.max_workers)]
+
+    def submit(self, slot, key, fn, *args, **kwargs) -> Job:
+        return self.submit_lazy(slot, key, fn, lambda: (args, kwargs))
+
+    def submit_lazy(self, slot, key, fn, make_arguments) -> Job:
+        # `make_arguments()` returns (args, kwargs); it only runs (outside the lock) when the job has to start
+        with self._lock:
+            job = self._attach(slot, key)
+        if job is not None:
+            return job
+        args, kwargs = make_arguments()
+        with self._lock:
+            job = self._attach(slot, key)
+            if job is None:
+                if self._executor is None:
+                    self._start()
+                job_id = uuid.uuid4().hex
+                with _neutral_main():  # the pool starts its worker processes on submit
+                    future = self._executor.submit(_execute, self._shared, job_id, fn, args, kwargs)
+                job = self._jobs[key] = Job(key, future, job_id, self._shared)
+                future.add_done_callback(lambda future, job = job: self._finish(job))
+            return job
+
+    def _attach(self, slot, key):
+        # Point `slot` at `key`; return the cached result or the live job for it, if any
+        self._release(slot, key)
+        cached = self.results.get(key)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return Job(key, future)
+        self._slots[slot] = key
+        return self._jobs.get(key)
+
+    def _release(self, slot, key):
+        # Drop the slot's previous job; cancel it when no other slot is waiting for it
+        previous = self._slots.pop(slot, None)
+        if previous is None or previous == key or previous in self._slots.values():
+            return
+        job = self._jobs.get(previous)
+        if job is not None:
+            self._cancel(job)
+
+    def _cancel(self, job: Job):
+        # A queued job is simply dropped; a running one stops at its next progress report
+        self._jobs.pop(job.key, None)
+        if not job.future.cancel():
+            self._shared[('cancel', job.job_id)] = True
+
+    def cancel(self, slot):
+        with self._lock:
+            key = self._slots.pop(slot, None)
+            job = self._jobs.get(key)
+            if job is not None and key not in self._slots.values():
+                self._cancel(job)
+
+    def _finish(self, job: Job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+        if not job.future.cancelled() and job.future.exception() is None:
+            self.results.put(job.key, job.future.result())
+        try:
+            for entry in (job.job_id, ('cancel', job.job_id)):
+                self._shared.pop(entry, None)
+        except (AttributeError, ConnectionError, EOFError):  # the manager is already shut down
+            pass
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait = False, cancel_futures = True)
+            self._manager.shutdown()
+            self._executor = self._manager = self._shared = None
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+# On-disk copy of the Seaborn datasets, so the app keeps working without network access
+SEABORN_DATA_HOME = os.environ.get('EDA_SEABORN_DATA', os.path.join('.cache', 'seaborn-data'))
+#------------------------------------------------------------------------------------------------------#
+
+def fingerprint_bytes(data: bytes) -> str:
+    # Content hash of an uploaded file, used as the cache key instead of the file name
+    return hashlib.sha1(data).hexdigest()
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    # Deep memory usage of a frame (counts the python objects behind object columns)
+    return int(df.memory_usage(index = True, deep = True).sum())
+
+
+class DatasetCache:
+    '''
+    LRU of loaded frames (or other bulky artifacts, e.g. rendered figures) shared by every session of the app.
+    Entries are evicted by count and by their total in-memory size,
+    so one big upload pushes out several small ones instead of blowing up the worker.
+    Objects derived from an entry (indexes, memoized intermediates ...) can be attached to it: they count
+    towards the same budget and are dropped with the entry, so they never keep an evicted frame alive.
+    '''
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 2 * 1024 ** 3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._nbytes = 0
+        self._attachments = {}         # key -> {name: object}
+        self._attaching = {}           # key -> lock, so an attachment is built once (reentrant: one may attach another)
+        self._lock = threading.Lock()
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        # Entries plus their attachments, the latter measured now since they may grow after being attached
+        return self._nbytes + sum(getattr(attachment, 'nbytes', 0)
+                                  for attachments in list(self._attachments.values()) for attachment in list(attachments.values()))
+
+    def get(self, key, default = None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes: int = None):
+        if nbytes is None:
+            if isinstance(value, pd.DataFrame):
+                nbytes = frame_nbytes(value)
+            elif isinstance(value, (bytes, str)):
+                nbytes = len(value)
+            elif hasattr(value, 'nbytes'):  # numpy arrays, Arrow tables
+                nbytes = int(value.nbytes)
+            else:
+                nbytes = 0
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+                evicted.append(self._detach(key))
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            # Never evict the entry that was just added, even if it alone exceeds the budget
+            while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                evicted_key, (_, evicted_nbytes) = self._entries.popitem(last = False)
+                self._nbytes -= evicted_nbytes
+                evicted.append(self._detach(evicted_key))
+        _close(evicted)
+        return value
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, loader())
+        return value
+
+    def _detach(self, key) -> dict:
+        self._attaching.pop(key, None)
+        return self._attachments.pop(key, {})
+
+    def attachment(self, key, name, factory):
+        '''
+        Object `name` attached to the entry `key`, built by `factory()` on first use. It is dropped (and closed,
+        when it has a `close()` method) together with the entry; while `key` is not cached it is built but not kept.
+        '''
+        with self._lock:
+            attachments = self._attachments.get(key, {})
+            if name in attachments:
+                return attachments[name]
+            lock = self._attaching.setdefault(key, threading.RLock()) if key in self._entries else threading.RLock()
+        with lock:
+            with self._lock:
+                attachments = self._attachments.get(key, {})
+                if name in attachments:
+                    return attachments[name]
+            value = factory()
+            with self._lock:
+                if key in self._entries:
+                    self._attachments.setdefault(key, {})[name] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            evicted = list(self._attachments.values())
+            self._entries.clear()
+            self._attachments.clear()
+            self._attaching.clear()
+            self._nbytes = 0
+        _close(evicted)
+
+
+def _close(evicted: list):
+    # Release the attachments of evicted entries (outside the cache lock: closing may touch the disk)
+    for attachments in evicted:
+        for attachment in attachments.values():
+            if hasattr(attachment, 'close'):
+                attachment.close()
+#------------------------------------------------------------------------------------------------------#
+
+def load_seaborn_dataset(name: str, data_home: str = SEABORN_DATA_HOME) -> pd.DataFrame:
+    # Seaborn only downloads the csv when it is missing from `data_home`
+    import seaborn as sns
+
+    os.makedirs(data_home, exist_ok = True)
+    return sns.load_dataset(name, cache = True, data_home = data_home)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+#------------------------------------------------------------------------------------------------------#
+
+SLOW_RERUN_SECONDS = float(os.environ.get('EDA_SLOW_RERUN_SECONDS', 2.0))   # reruns slower than this go to the slow log
+HISTORY_RERUNS = 500                                                          # reruns kept in memory for the Performance tab
+
+logger = logging.getLogger('eda.perf')
+#------------------------------------------------------------------------------------------------------#
+
+def rss_bytes() -> int | None:
+    # Resident memory of the process: psutil when installed, /proc on Linux, otherwise unknown
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@dataclass
+class Stage:
+    name: str
+    seconds: float
+    cpu_seconds: float                 # CPU time of the whole process (other sessions' threads included)
+    rss_delta: int | None = None       # change of resident memory across the stage, in bytes
+
+
+@dataclass
+class RerunRecord:
+    started: float                     # unix time
+    seconds: float
+    stages: list = field(default_factory = list)
+    context: dict = field(default_factory = dict)   # dataset, shape, menu & widget state
+
+    @property
+    def is_slow(self) -> bool:
+        return self.seconds >= SLOW_RERUN_SECONDS
+#------------------------------------------------------------------------------------------------------#
+
+class PerfRecorder:
+    '''
+    Timings of one rerun of the page: `with recorder.stage('name'):` around each step,
+    then `finish(context)` once the script reaches its end.
+    '''
+
+    def __init__(self):
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name: str):
+        rss, wall, cpu = rss_bytes(), time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            after = rss_bytes()
+            self.stages.append(Stage(
+                name = name,
+                seconds = time.perf_counter() - wall,
+                cpu_seconds = time.process_time() - cpu,
+                rss_delta = None if rss is None or after is None else after - rss,
+            ))
+
+    def finish(self, context: dict = None) -> RerunRecord:
+        return RerunRecord(self.started, time.perf_counter() - self._start, self.stages, context or {})
+
+
+class PerfLog:
+    '''
+    Process-wide history of reruns (every session), with per-stage aggregates
+    and JSON / Prometheus text exports. Slow reruns are also written to the `eda.perf` logger.
+    '''
+
+    def __init__(self, max_reruns: int = HISTORY_RERUNS):
+        self.reruns = deque(maxlen = max_reruns)
+        self.slow = deque(maxlen = max_reruns)
+        self.slow_count = 0
+        self.rerun_count = 0
+        self.rerun_seconds = 0.0
+        self._totals = {}    # stage -> [count, total seconds, max seconds], since the process started
+        self._lock = threading.Lock()
+
+    def record(self, rerun: RerunRecord):
+        with self._lock:
+            self.reruns.append(rerun)
+            self.rerun_count += 1
+            self.rerun_seconds += rerun.seconds
+            for stage in rerun.stages:
+                totals = self._totals.setdefault(stage.name, [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += stage.seconds
+                totals[2] = max(totals[2], stage.seconds)
+            if rerun.is_slow:
+                self.slow.append(rerun)
+                self.slow_count += 1
+        if rerun.is_slow:
+            slowest = max(rerun.stages, key = lambda stage: stage.seconds, default = None)
+            logger.warning("Slow rerun: %.2fs (slowest stage: %s) %s",
+                           rerun.seconds, f"{slowest.name} {slowest.seconds:.2f}s" if slowest else '-', json.dumps(rerun.context, default = str))
+
+    def stage_summary(self) -> list:
+        # [{stage, count, total, mean, max}] since the process started, slowest total first
+        with self._lock:
+            totals = {name: tuple(values) for name, values in self._totals.items()}
+        rows = [{'stage': name, 'count': count, 'total': total, 'mean': total / count, 'max': longest}
+                for name, (count, total, longest) in totals.items()]
+        return sorted(rows, key = lambda row: row['total'], reverse = True)
+
+    def to_json(self) -> str:
+        with self._lock:
+            reruns, slow = list(self.reruns), list(self.slow)
+        return json.dumps({
+            'slow_rerun_seconds': SLOW_RERUN_SECONDS,
+            'stages': self.stage_summary(),
+            'reruns': [asdict(rerun) for rerun in reruns],
+            'slow_reruns': [asdict(rerun) for rerun in slow],
+        }, indent = 2, default = str)
+
+    def to_prometheus(self) -> str:
+        # Text exposition format: counts & sums per stage, plus the rerun totals
+        lines = [
+            '# HELP eda_stage_seconds Wall time spent in each stage of the page',
+            '# TYPE eda_stage_seconds summary',
+        ]
+        for row in self.stage_summary():
+            label = row['stage'].replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'eda_stage_seconds_count{{stage="{label}"}} {row["count"]}')
+            lines.append(f'eda_stage_seconds_sum{{stage="{label}"}} {row["total"]:.6f}')
+        lines += [
+            '# HELP eda_rerun_seconds Wall time of whole reruns',
+            '# TYPE eda_rerun_seconds summary',
+            f'eda_rerun_seconds_count {self.rerun_count}',
+            f'eda_rerun_seconds_sum {self.rerun_seconds:.6f}',
+            '# HELP eda_slow_reruns_total Reruns slower than the slow-rerun threshold',
+            '# TYPE eda_slow_reruns_total counter',
+            f'eda_slow_reruns_total {self.slow_count}',
+        ]
+        rss = rss_bytes()
+        if rss is not None:
+            lines += ['# HELP eda_process_resident_bytes Resident memory of the app process',
+                      '# TYPE eda_process_resident_bytes gauge',
+                      f'eda_process_resident_bytes {rss}']
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from toolkit.stats import factorize_categories, numeric_vector
+#------------------------------------------------------------------------------------------------------#
+
+LARGE_N_ROWS = 200_000      # above this many rows plots switch to binned densities / sampled points
+SAMPLE_ROWS = 50_000        # rows kept by the stratified sample of point-based plots
+MIN_ROWS_PER_GROUP = 200    # ... while keeping at least this many rows of every (small) group
+KDE_GRIDSIZE = 512
+KDE2D_GRIDSIZE = 128        # cells per axis of the binned 2D densities
+HEXBIN_GRIDSIZE = 60
+MAX_DENSITY_PANELS = 12     # categories beyond the most frequent ones share a single "other" panel
+#------------------------------------------------------------------------------------------------------#
+
+def is_large(n_rows: int) -> bool:
+    return n_rows > LARGE_N_ROWS
+
+
+def stratified_sample(df: pd.DataFrame, by: str | None, n: int = SAMPLE_ROWS, seed: int = 0) -> pd.DataFrame:
+    '''
+    Row sample of about `n` rows, proportional to the size of each `by` group
+    but never dropping a group: small groups keep up to MIN_ROWS_PER_GROUP rows.
+    '''
+    if len(df) <= n:
+        return df
+    rng = np.random.default_rng(seed)
+    if by is None:
+        return df.iloc[np.sort(rng.choice(len(df), n, replace = False))]
+
+    codes, _ = pd.factorize(df[by])
+    codes = codes.astype(np.int64) + 1  # missing values form their own group
+    counts = np.bincount(codes)
+    quota = np.minimum(counts, np.maximum(np.round(counts * n / len(df)).astype(np.int64), MIN_ROWS_PER_GROUP))
+
+    # Shuffle, then group the shuffled rows: the first `quota` rows of every group are a random subset
+    shuffled = rng.permutation(len(df))
+    grouped = shuffled[np.argsort(codes[shuffled], kind = 'stable')]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    keep = np.concatenate([grouped[start:start + size] for start, size in zip(starts, quota) if size])
+    return df.iloc[np.sort(keep)]
+
+
+def is_sampled(n_rows: int, n: int = SAMPLE_ROWS) -> bool:
+    return n_rows > n
+
+
+def sample_note(n_rows: int, n: int = SAMPLE_ROWS) -> str:
+    return f"ℹ️ {n_rows:,} rows: the plot below uses a stratified sample of about {n:,} rows"
+#------------------------------------------------------------------------------------------------------#
+
+def binned_kde(values: np.ndarray, grid: np.ndarray, bandwidth: float | None = None) -> np.ndarray:
+    '''
+    Gaussian KDE evaluated on an evenly spaced `grid` by binning the data and convolving
+    the histogram with the kernel through an FFT: O(n + g log g) instead of O(n * g).
+    '''
+    from scipy.signal import fftconvolve
+
+    values = values[np.isfinite(values)]
+    if len(values) < 2:
+        return np.zeros_like(grid)
+    if bandwidth is None:
+        # Scott's rule, as scipy / seaborn
+        bandwidth = values.std(ddof = 1) * len(values) ** (-1 / 5)
+    step = grid[1] - grid[0]
+    if bandwidth <= 0:
+        bandwidth = step
+    edges = np.concatenate((grid - step / 2, [grid[-1] + step / 2]))
+    counts, _ = np.histogram(values, bins = edges)
+
+    half_width = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= kernel.sum()
+    density = fftconvolve(counts, kernel, mode = 'same')
+    density = np.clip(density, 0, None)
+    return density / (len(values) * step)
+
+
+def kde_support(values: np.ndarray, gridsize: int = KDE_GRIDSIZE, cut: float = 3) -> np.ndarray:
+    values = values[np.isfinite(values)]
+    bandwidth = values.std(ddof = 1) * len(values) ** (-1 / 5) if len(values) > 1 else 1.0
+    low, high = values.min() - cut * bandwidth, values.max() + cut * bandwidth
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, gridsize)
+#------------------------------------------------------------------------------------------------------#
+
+def split_by_group(categories: pd.Series, values: pd.Series) -> list:
+    # [(label, values of that group)] from one factorize + sort, instead of one mask per group
+    codes, labels = factorize_categories(categories)
+    return split_codes(codes, labels, numeric_vector(values))
+
+
+def split_codes(codes: np.ndarray, labels, values: np.ndarray) -> list:
+    # split_by_group on an already factorized category column and numeric vector; missing values are dropped,
+    # and so are the categories left without any value
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    order = np.argsort(codes, kind = 'stable')
+    parts = np.split(values[order], np.cumsum(np.bincount(codes, minlength = len(labels)))[:-1])
+    return [(label, part) for label, part in zip(labels, parts) if len(part)]
+
+
+def fold_categories(categories: list, max_panels: int = MAX_DENSITY_PANELS) -> tuple:
+    # (shown, folded): with too many categories (most frequent first) the tail is folded into one extra panel
+    categories = list(categories)
+    if len(categories) <= max_panels:
+        return categories, []
+    return categories[:max_panels - 1], categories[max_panels - 1:]
+
+
+def partition_xy(categories: pd.Series, x: pd.Series, y: pd.Series, shown: list, fold_other: bool = False) -> list:
+    '''
+    [(xs, ys)] per panel from one factorize + sort: one entry per `shown` category, in that order,
+    plus a last entry pooling every other category when `fold_other`. Rows with missing values are dropped.
+    '''
+    codes, labels = pd.factorize(categories)
+    panel_of_code = pd.Index(shown).get_indexer(labels)
+    if fold_other:
+        panel_of_code = np.where(panel_of_code < 0, len(shown), panel_of_code)
+    n_panels = len(shown) + bool(fold_other)
+
+    xs = pd.to_numeric(x, errors = 'coerce').to_numpy(dtype = float, na_value = np.nan)
+    ys = pd.to_numeric(y, errors = 'coerce').to_numpy(dtype = float, na_value = np.nan)
+    panels = np.where(codes >= 0, panel_of_code[codes], -1)
+    valid = (panels >= 0) & np.isfinite(xs) & np.isfinite(ys)
+    panels, xs, ys = panels[valid], xs[valid], ys[valid]
+    order = np.argsort(panels, kind = 'stable')
+    bounds = np.cumsum(np.bincount(panels, minlength = n_panels))[:-1]
+    return list(zip(np.split(xs[order], bounds), np.split(ys[order], bounds)))
+
+
+def binned_kde_2d(xs: np.ndarray, ys: np.ndarray, gridsize: int = KDE2D_GRIDSIZE, cut: float = 3):
+    '''
+    Gaussian 2D KDE (full-covariance Scott bandwidth, as `gaussian_kde` / seaborn) on a regular grid:
+    a 2D histogram convolved with the kernel through an FFT. Returns (x grid, y grid, density[x, y]),
+    or None when the points are too few or degenerate to estimate a density.
+    '''
+    from scipy.signal import fftconvolve
+
+    if len(xs) < 3:
+        return None
+    kernel_cov = np.cov(xs, ys) * len(xs) ** (-2 / 6)
+    if not np.all(np.isfinite(kernel_cov)) or np.linalg.det(kernel_cov) <= 0:
+        return None
+    bandwidth = np.sqrt(np.diag(kernel_cov))
+    grids = [np.linspace(values.min() - cut * bw, values.max() + cut * bw, gridsize) for values, bw in zip((xs, ys), bandwidth)]
+    steps = np.array([grid[1] - grid[0] for grid in grids])
+    edges = [np.concatenate((grid - step / 2, [grid[-1] + step / 2])) for grid, step in zip(grids, steps)]
+    counts, _, _ = np.histogram2d(xs, ys, bins = edges)
+
+    half = np.minimum(np.ceil(4 * bandwidth / steps).astype(int), gridsize)
+    dx, dy = np.meshgrid(np.arange(-half[0], half[0] + 1) * steps[0], np.arange(-half[1], half[1] + 1) * steps[1], indexing = 'ij')
+    offsets = np.stack((dx.ravel(), dy.ravel()))
+    kernel = np.exp(-0.5 * np.sum(offsets * (np.linalg.inv(kernel_cov) @ offsets), axis = 0)).reshape(dx.shape)
+    kernel /= kernel.sum()
+    density = np.clip(fftconvolve(counts, kernel, mode = 'same'), 0, None) / (len(xs) * steps.prod())
+    return grids[0], grids[1], density
+
+
+def kde_levels(density: np.ndarray, levels: int = 10, thresh: float = 0.05) -> np.ndarray:
+    # Iso-proportion contour levels, as seaborn: the lowest one encloses 1 - thresh of the probability mass
+    values = np.sort(density.ravel())[::-1]
+    mass = np.cumsum(values) / values.sum()
+    bounds = np.take(values, np.searchsorted(mass, 1 - np.linspace(thresh, 1, levels)), mode = 'clip')
+    return np.unique(np.append(bounds, values[0]))
+
+
+def binned_violinplot(df: pd.DataFrame, x: str, y: str, ax, palette: str = "muted", groups: list = None):
+    # Violins from binned KDEs sharing one grid; each violin is scaled to the same maximum width.
+    # `groups` may hold the split_by_group result of x & y, when it is already at hand
+    import seaborn as sns
+
+    groups = groups if groups is not None else split_by_group(df[x], df[y])
+    if not groups:
+        return
+    grid = kde_support(np.concatenate([values for _, values in groups]))  # over the rows having both values
+    colors = sns.color_palette(palette, len(groups))
+    for position, ((label, values), color) in enumerate(zip(groups, colors)):
+        density = binned_kde(values, grid)
+        if density.max() > 0:
+            half = 0.4 * density / density.max()
+            ax.fill_betweenx(grid, position - half, position + half, facecolor = color, edgecolor = 'gray', linewidth = 1)
+        q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75])
+        ax.vlines(position, q1, q3, color = '0.25', linewidth = 4)
+        ax.scatter([position], [median], color = 'white', s = 20, zorder = 3)
+    ax.set_xticks(range(len(groups)))
+    ax.set_xticklabels([str(label) for label, _ in groups])
+
+
+def binned_fill_kdeplot(df: pd.DataFrame, x: str, hue: str, ax, palette: str, clip = (None, None), groups: list = None):
+    # Equivalent of `displot(kind = "kde", multiple = "fill")`: conditional share of every group along x
+    import seaborn as sns
+
+    groups = groups if groups is not None else split_by_group(df[hue], df[x])
+    if not groups:
+        return
+    grid = kde_support(np.concatenate([values for _, values in groups]))  # over the rows having both values
+    low, high = clip
+    grid = grid[(grid >= (low if low is not None else -np.inf)) & (grid <= (high if high is not None else np.inf))]
+    weighted = np.array([binned_kde(values, grid) * len(values) for _, values in groups])
+    total = weighted.sum(axis = 0)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        # Shares of a vanishing total are numerical noise: leave those tails empty
+        shares = np.where(total > 1e-6 * total.max(), weighted / total, np.nan)
+    colors = sns.color_palette(palette, len(groups))
+    ax.stackplot(grid, shares, labels = [str(label) for label, _ in groups], colors = colors, alpha = 0.9)
+    ax.set_xlim(grid[0], grid[-1])
+    ax.set_ylim(0, 1)
+    ax.set_xlabel(x)
+    ax.set_ylabel('Density')
+    ax.legend(title = hue, loc = 'center left', bbox_to_anchor = (1, 0.5))
+
+
+def pointplot_from_stats(stats, ax, color = "xkcd:greenish"):
+    # Group means with normal-approximation 95% intervals, instead of bootstrapping every row
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        interval = 1.96 * stats.std / np.sqrt(stats.count)
+    positions = np.arange(len(stats.labels))
+    ax.errorbar(positions, stats.mean, yerr = interval, color = color, marker = 'o', linewidth = 2.5)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([str(label) for label in stats.labels])
+
+
+def density_hexbin(x: np.ndarray, y: np.ndarray, ax, cmap: str = "Greens"):
+    # 2D histogram on hexagons: the large-n stand-in for a 2D KDE
+    ax.hexbin(x, y, gridsize = HEXBIN_GRIDSIZE, cmap = cmap, mincnt = 1)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+VALUE_COUNTS_MAX_LEVELS = 10_000                       # columns with more distinct values keep no value-count table
+SKETCH_SAMPLE_SIZE = 4_096                             # rows sampled for the quantile sketch
+SKETCH_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+#------------------------------------------------------------------------------------------------------#
+
+def column_kind(series: pd.Series) -> str:
+    # Same split as `select_dtypes(include = ['number'])` / `(include = ['object', 'category'])`
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'boolean'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return 'categorical'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'other'
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    kind: str
+    null_count: int
+    cardinality: int
+    value_counts: pd.Series | None = None              # non-null value -> count, most frequent first
+    min: object = None
+    max: object = None
+    sketch: pd.Series | None = None                    # approximate quantiles of numeric columns
+
+
+@dataclass
+class DatasetProfile:
+    n_rows: int
+    columns: dict = field(default_factory = dict)      # column name -> ColumnProfile
+
+    def __getitem__(self, column: str) -> ColumnProfile:
+        return self.columns[column]
+
+    def columns_of_kind(self, kind: str) -> list:
+        return [name for name, column in self.columns.items() if column.kind == kind]
+
+    @property
+    def numeric_columns(self) -> list:
+        return self.columns_of_kind('numeric')
+
+    @property
+    def categorical_columns(self) -> list:
+        return self.columns_of_kind('categorical')
+
+    def overview(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {'Types': [column.dtype for column in self.columns.values()],
+             'Nulls': [column.null_count for column in self.columns.values()],
+             'Unique': [column.cardinality for column in self.columns.values()]},
+            index = list(self.columns),
+        )
+#------------------------------------------------------------------------------------------------------#
+
+def profile_column(series: pd.Series, rng: np.random.Generator) -> ColumnProfile:
+    kind = column_kind(series)
+    non_null = series.dropna()
+    profile = ColumnProfile(
+        name = series.name,
+        dtype = str(series.dtype),
+        kind = kind,
+        null_count = int(len(series) - len(non_null)),
+        cardinality = 0,
+    )
+
+    # Hash-count each column once; very high-cardinality columns only keep the count of distinct values
+    counts = non_null.value_counts(sort = True)
+    counts = counts[counts > 0]  # unused levels of categoricals
+    profile.cardinality = int(len(counts))
+    if profile.cardinality <= VALUE_COUNTS_MAX_LEVELS:
+        profile.value_counts = counts
+
+    if kind in ('numeric', 'datetime') and len(non_null):
+        profile.min, profile.max = non_null.min(), non_null.max()
+    if kind == 'numeric' and len(non_null):
+        sample = non_null.to_numpy(dtype = float)
+        if len(sample) > SKETCH_SAMPLE_SIZE:
+            sample = rng.choice(sample, SKETCH_SAMPLE_SIZE, replace = False)
+        profile.sketch = pd.Series(np.quantile(sample, SKETCH_QUANTILES), index = SKETCH_QUANTILES)
+    return profile
+
+
+def build_profile(df: pd.DataFrame, seed: int = 0) -> DatasetProfile:
+    '''
+    Scan every column once: dtype class, nulls, cardinality, value counts, min/max and a quantile sketch.
+    Tabs read column lists and counts from here instead of re-scanning the frame on every rerun.
+    '''
+    rng = np.random.default_rng(seed)
+    return DatasetProfile(
+        n_rows = len(df),
+        columns = {col: profile_column(df[col], rng) for col in df.columns},
+    )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class GroupStats:
+    # Sufficient statistics of a numeric column split by a categorical one, one entry per group
+    labels: pd.Index
+    count: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray          # sum of squared deviations from the group mean
+    minimum: np.ndarray
+    maximum: np.ndarray
+    quantiles: dict         # q -> per-group quantile (linear interpolation, as pandas)
+
+    @property
+    def std(self) -> np.ndarray:
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            return np.sqrt(self.m2 / (self.count - 1))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {'count': self.count,
+             'mean': self.mean,
+             'std': self.std,
+             'q1': self.quantiles[0.25],
+             'median': self.quantiles[0.5],
+             'q3': self.quantiles[0.75]},
+            index = self.labels,
+        )
+
+
+@dataclass
+class AnovaResult:
+    statistic: float
+    pvalue: float
+    df_between: int
+    df_within: int
+#------------------------------------------------------------------------------------------------------#
+
+def factorize_categories(categories: pd.Series) -> tuple:
+    # (codes, labels): labels in sorted order, code -1 for missing values; mixed types are ordered by their string form
+    try:
+        return pd.factorize(categories, sort = True)
+    except TypeError:
+        codes, labels = pd.factorize(categories)
+        order = np.argsort(np.asarray(labels.astype(str)), kind = 'stable')
+        rank = np.empty(len(order), dtype = codes.dtype)
+        rank[order] = np.arange(len(order))
+        return np.where(codes >= 0, rank[np.maximum(codes, 0)], -1), labels[order]
+
+
+def numeric_vector(values: pd.Series) -> np.ndarray:
+    # float64 values, NaN where missing or not a number
+    return pd.to_numeric(values, errors = 'coerce').to_numpy(dtype = float)
+
+
+def group_statistics(categories: pd.Series, values: pd.Series, quantiles = (0.25, 0.5, 0.75)) -> GroupStats:
+    '''
+    Counts, means, sums of squares, min/max and quantiles of every group in one pass:
+    a single factorize, bincounts for the moments and one sort for the order statistics,
+    instead of one boolean mask (and one quantile call) per group.
+    '''
+    codes, labels = factorize_categories(categories)
+    return group_statistics_from_codes(codes, pd.Index(labels, name = categories.name), numeric_vector(values), quantiles)
+
+
+def group_statistics_from_codes(codes: np.ndarray, labels: pd.Index, values: np.ndarray, quantiles = (0.25, 0.5, 0.75)) -> GroupStats:
+    # group_statistics on an already factorized category column and numeric vector (see factorize_categories / numeric_vector)
+    valid = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    k = len(labels)
+
+    count = np.bincount(codes, minlength = k)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        mean = np.bincount(codes, weights = values, minlength = k) / count
+    deviation = values - mean[codes]  # two-pass: stable even for large offsets
+    m2 = np.bincount(codes, weights = deviation * deviation, minlength = k)
+
+    # Sort by (group, value) once; every group is then a contiguous, ordered slice
+    sorted_values = values[np.lexsort((values, codes))]
+    start = np.concatenate(([0], np.cumsum(count)[:-1]))
+    last = start + np.maximum(count - 1, 0)
+    empty = count == 0
+    if len(sorted_values):
+        minimum = np.where(empty, np.nan, sorted_values[np.minimum(start, len(sorted_values) - 1)])
+        maximum = np.where(empty, np.nan, sorted_values[np.minimum(last, len(sorted_values) - 1)])
+    else:
+        minimum = maximum = np.full(k, np.nan)
+
+    group_quantiles = {}
+    for q in quantiles:
+        position = (count - 1) * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        low_idx = np.clip(start + lower, 0, max(len(sorted_values) - 1, 0))
+        high_idx = np.clip(start + upper, 0, max(len(sorted_values) - 1, 0))
+        if len(sorted_values):
+            low_value, high_value = sorted_values[low_idx], sorted_values[high_idx]
+            group_quantiles[q] = np.where(empty, np.nan, low_value + (position - lower) * (high_value - low_value))
+        else:
+            group_quantiles[q] = np.full(k, np.nan)
+
+    # Categories without any numeric value form no group, as in a groupby of the rows having both values
+    kept = ~empty
+    return GroupStats(
+        labels = labels[kept],
+        count = count[kept],
+        mean = mean[kept],
+        m2 = m2[kept],
+        minimum = minimum[kept],
+        maximum = maximum[kept],
+        quantiles = {q: group_quantiles[q][kept] for q in quantiles},
+    )
+
+
+def one_way_anova(stats: GroupStats) -> AnovaResult:
+    # F-statistic straight from the group sizes, means and within-group sums of squares
+    from scipy.stats import f as f_distribution
+
+    present = stats.count > 0
+    count, mean, m2 = stats.count[present], stats.mean[present], stats.m2[present]
+    n, k = count.sum(), len(count)
+    grand_mean = (count * mean).sum() / n
+    ss_between = (count * (mean - grand_mean) ** 2).sum()
+    ss_within = m2.sum()
+    df_between, df_within = k - 1, n - k
+    statistic = (ss_between / df_between) / (ss_within / df_within)
+    pvalue = f_distribution.sf(statistic, df_between, df_within)
+    return AnovaResult(float(statistic), float(pvalue), int(df_between), int(df_within))
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------------------------------------------#
+
+SUMMARY_PERCENTILES = (0.25, 0.5, 0.75, 0.9, 0.95)
+SKETCH_K = 512                   # size of the top compactor of the quantile sketch: larger is more accurate
+CHUNK_ROWS = 250_000             # rows summarized at a time when an in-memory frame is streamed
+#------------------------------------------------------------------------------------------------------#
+
+@dataclass
+class RunningMoments:
+    # Count, mean, sum of squared deviations and min/max of a stream, mergeable across chunks
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = np.nan
+    maximum: float = np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        # Chan et al. pairwise update: exact, in any order of the chunks
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.minimum, self.maximum = other.count, other.mean, other.m2, other.minimum, other.maximum
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def update(self, values: np.ndarray) -> 'RunningMoments':
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        mean = values.mean()
+        deviation = values - mean
+        return self.merge(RunningMoments(len(values), float(mean), float(deviation @ deviation), float(values.min()), float(values.max())))
+
+
+class KllSketch:
+    '''
+    KLL quantile sketch: a stack of compactors where level h holds items of weight 2^h.
+    A full level is sorted and every other item (from a random offset) moves up one level,
+    so memory stays O(K) whatever the length of the stream, and two sketches merge level by level.
+    As long as nothing has been compacted the quantiles are exact.
+    '''
+
+    def __init__(self, k: int = SKETCH_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def _capacity(self, level: int) -> int:
+        # Lower levels get geometrically smaller compactors (c = 2/3), the top one holds K items
+        depth = len(self.levels) - level - 1
+        return max(8, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                kept, items = (items[:1], items[1:]) if len(items) % 2 else (items[:0], items)
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level += 1
+
+    def update(self, values: np.ndarray) -> 'KllSketch':
+        values = values[~np.isnan(values)]
+        self.n += len(values)
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+        return self
+
+    def merge(self, other: 'KllSketch') -> 'KllSketch':
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs) -> np.ndarray:
+        qs = np.asarray(qs, dtype = float)
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        if self.is_exact:
+            return np.quantile(self.levels[0], qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind = 'stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        # Item whose weighted rank first passes q * (n - 1), the same target as linear interpolation
+        ranks = qs * (cumulative[-1] - 1)
+        return items[np.minimum(np.searchsorted(cumulative, ranks, side = 'right'), len(items) - 1)]
+#------------------------------------------------------------------------------------------------------#
+
+def frame_chunks(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _percentile_label(q: float) -> str:
+    # Same row labels as `DataFrame.describe`
+    return f"{q * 100:g}%"
+
+
+def summarize_chunks(chunks, percentiles = SUMMARY_PERCENTILES, k: int = SKETCH_K) -> pd.DataFrame:
+    '''
+    One-pass equivalent of `describe(percentiles)` over an iterable of frames with the same numeric columns:
+    exact count / mean / std / min / max and sketched quantiles, combined chunk by chunk.
+    `result.attrs['approximate']` tells whether any quantile came from a compacted sketch.
+    '''
+    moments, sketches = {}, {}
+    for chunk in chunks:
+        for column in chunk.columns:
+            values = pd.to_numeric(chunk[column], errors = 'coerce').to_numpy(dtype = float, na_value = np.nan)
+            if column not in moments:
+                moments[column], sketches[column] = RunningMoments(), KllSketch(k)
+            moments[column].update(values)
+            sketches[column].update(values)
+
+    percentiles = sorted(percentiles)
+    index = ['count', 'mean', 'std', 'min'] + [_percentile_label(q) for q in percentiles] + ['max']
+    summary = pd.DataFrame(
+        {column: [float(stats.count), stats.mean if stats.count else np.nan, stats.std, stats.minimum,
+                  *sketches[column].quantiles(percentiles), stats.maximum]
+         for column, stats in moments.items()},
+        index = index,
+    )
+    summary.attrs['approximate'] = not all(sketch.is_exact for sketch in sketches.values())
+    return summary